@@ -0,0 +1,421 @@
+"""Benchmarks for dish_card on synthetic Heritage Fest submissions.
+
+Generate a synthetic CSV shaped like the form export::
+
+    python benchmark.py generate synthetic.csv --rows 5000
+
+Time every stage for several submission counts and write the results as
+JSON, so that runs before and after a change can be compared::
+
+    python benchmark.py run --rows 10 100 1000 --output bench.json
+
+Every submission count runs in a fresh process, so its peak memory is not
+inherited from the counts benchmarked before it.
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import dish_card
+
+# Header of the Google Form export
+CSV_HEADER = [
+    "Timestamp",
+    "Name of the dish:",
+    "Provided by:",
+    "Represented cuisine:",
+    "Type of the dish:",
+    "Ingredients:",
+    "Protein/Category:",
+    "Allergen (Nuts are not allowed, see ACS allergy policy):",
+    "Do you need an electrical outlet?",
+    "If you have any special note, you can write below.",
+]
+
+WORDS = (
+    "rice beans tomato onion garlic pepper lamb chicken yogurt lentil mint "
+    "parsley cumin saffron honey walnut flour butter lemon olive chickpea "
+    "eggplant cabbage potato cheese coconut ginger chili sesame cinnamon"
+).split()
+CUISINES = ["Turkish", "Indian", "Mexican", "Chinese", "Nigerian", "Italian"]
+PROTEINS = ["Vegetarian", "Vegan", "Beef", "Poultry", "Pork", "Halal", "Kosher"]
+ALLERGENS = ["Gluten", "Dairy", "Egg", "Soy", "Sesame", "Shellfish"]
+# Default mix of dish types; types outside dish_card.type_order are included
+DISH_TYPES = {
+    "Appetizer": 3,
+    "Salad": 2,
+    "Main course": 4,
+    "Dessert": 3,
+    "Drink": 1,
+    "Soup": 1,
+}
+
+
+def _phrase(rng, length):
+    return " ".join(rng.choice(WORDS) for _ in range(max(1, length)))
+
+
+def _with_emoji(rng, text, emoji_density):
+    # The form puts dietary emojis after the answer, separated by a space
+    if rng.random() < emoji_density:
+        text += " " + rng.choice(list(dish_card.dietary_emojis))
+    return text
+
+
+def generate_csv(
+    path,
+    rows,
+    seed=0,
+    field_length=6,
+    emoji_density=0.5,
+    dish_types=None,
+    outlet_ratio=0.2,
+):
+    """Write a synthetic submissions CSV with the given number of rows
+
+    field_length is the mean number of words in free-text answers,
+    emoji_density the share of answers carrying a dietary emoji, dish_types
+    a {type: weight} mix and outlet_ratio the share needing an outlet.
+    """
+    rng = random.Random(seed)
+    dish_types = dish_types or DISH_TYPES
+    types, weights = zip(*dish_types.items())
+
+    def length(scale=1.0):
+        return int(rng.expovariate(1 / (field_length * scale))) + 1
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        for i in range(rows):
+            notes = _phrase(rng, length(2)) if rng.random() < 0.3 else ""
+            allergens = ", ".join(rng.sample(ALLERGENS, rng.randint(0, 3)))
+            writer.writerow(
+                [
+                    f"2026-03-{1 + i % 28:02d} 18:00:00",
+                    _phrase(rng, length(0.5)).title(),
+                    f"Family {rng.randint(1, max(1, rows // 2))}",
+                    _with_emoji(rng, rng.choice(CUISINES), emoji_density),
+                    rng.choices(types, weights)[0],
+                    _phrase(rng, length(2)),
+                    _with_emoji(rng, rng.choice(PROTEINS), emoji_density),
+                    allergens,
+                    "Yes" if rng.random() < outlet_ratio else "No",
+                    notes,
+                ]
+            )
+
+
+def _write_assets(directory):
+    """Create a high-resolution logo and a QR placeholder image"""
+    from PIL import Image
+
+    Image.new("RGB", (3000, 2000), (0, 31, 92)).save(
+        os.path.join(directory, dish_card.logo_path)
+    )
+    Image.new("L", (600, 600), 0).save(os.path.join(directory, dish_card.qr_code_path))
+
+
+def _peak_rss_mb():
+    """High-water mark of the process memory, or None where unsupported"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def _memory_mark(trace_memory=False):
+    """Note the memory use before a stage, for _stage()
+
+    The process high-water mark only ever grows, so a stage is credited with
+    how much it raised it. With trace_memory, tracemalloc is restarted so
+    its peak covers the stage alone; that slows the stage down.
+    """
+    if trace_memory:
+        import tracemalloc
+
+        tracemalloc.stop()
+        tracemalloc.start()
+    return _peak_rss_mb()
+
+
+def _output_bytes(*paths):
+    total = 0
+    for path in paths:
+        if os.path.isdir(path):
+            total += sum(
+                os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)
+            )
+        elif os.path.exists(path):
+            total += os.path.getsize(path)
+    return total
+
+
+def _reset_caches():
+    dish_card.string_width.cache_clear()
+    dish_card._wrap_lines.cache_clear()
+    dish_card._image_cache.clear()
+
+
+def _stage(name, items, seconds, output_bytes=None, mark=None):
+    import tracemalloc
+
+    peak = _peak_rss_mb()
+    result = {
+        "stage": name,
+        "items": items,
+        "seconds": round(seconds, 6),
+        "items_per_second": round(items / seconds, 2) if seconds else None,
+        "peak_rss_mb": None if peak is None else round(peak, 1),
+        "rss_growth_mb": None if mark is None else round(peak - mark, 1),
+    }
+    if tracemalloc.is_tracing():
+        result["peak_traced_mb"] = round(
+            tracemalloc.get_traced_memory()[1] / (1 << 20), 1
+        )
+    if output_bytes is not None:
+        result["output_bytes"] = output_bytes
+    return result
+
+
+def benchmark(
+    rows, card_limit=1000, menu_columns=1, trace_memory=False, **generator_options
+):
+    """Time every stage on a synthetic CSV with the given number of rows
+
+    Memory figures are only comparable between sizes when every size runs in
+    a fresh process, as benchmark_isolated() does.
+    """
+    stages = []
+    cwd = os.getcwd()
+    directory = tempfile.mkdtemp(prefix="dish_card_bench_")
+    try:
+        os.chdir(directory)
+        _write_assets(directory)
+        generate_csv(dish_card.csv_file, rows, **generator_options)
+        _reset_caches()
+
+        mark = _memory_mark(trace_memory)
+        start = time.perf_counter()
+        records = list(dish_card.iter_dishes(dish_card.csv_file))
+        stages.append(_stage("csv_load", rows, time.perf_counter() - start, None, mark))
+
+        mark = _memory_mark(trace_memory)
+        start = time.perf_counter()
+        dishes = list(dish_card.normalize_dishes(records))
+        stages.append(
+            _stage("normalize", rows, time.perf_counter() - start, None, mark)
+        )
+        del records
+
+        # Per-card timings, on at most card_limit cards
+        os.makedirs(dish_card.output_dir, exist_ok=True)
+        card_times = []
+        mark = _memory_mark(trace_memory)
+        for idx, dish in enumerate(dishes[:card_limit]):
+            start = time.perf_counter()
+            dish_card.create_dish_card(dish, idx)
+            card_times.append(time.perf_counter() - start)
+        card_stage = _stage(
+            "create_dish_card",
+            len(card_times),
+            sum(card_times),
+            _output_bytes(dish_card.output_dir),
+            mark,
+        )
+        card_times.sort()
+        if card_times:
+            card_stage["median_seconds"] = round(card_times[len(card_times) // 2], 6)
+            card_stage["p95_seconds"] = round(
+                card_times[int(len(card_times) * 0.95)], 6
+            )
+        stages.append(card_stage)
+
+        mark = _memory_mark(trace_memory)
+        start = time.perf_counter()
+        pages = dish_card.create_menu(dishes, "menu.pdf", menu_columns)
+        menu_stage = _stage(
+            "create_menu",
+            rows,
+            time.perf_counter() - start,
+            _output_bytes("menu.pdf"),
+            mark,
+        )
+        menu_stage["pages"] = pages
+        stages.append(menu_stage)
+
+        mark = _memory_mark(trace_memory)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            dish_card.create_empty_dish_card()
+        stages.append(
+            _stage(
+                "create_empty_dish_card",
+                1,
+                time.perf_counter() - start,
+                _output_bytes("dish_card.pdf"),
+                mark,
+            )
+        )
+
+        mark = _memory_mark(trace_memory)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            dish_card.create_signs()
+        signs = [name for name in os.listdir(".") if name.endswith("_sign.pdf")]
+        stages.append(
+            _stage(
+                "create_signs",
+                len(signs),
+                time.perf_counter() - start,
+                _output_bytes(*signs),
+                mark,
+            )
+        )
+    finally:
+        if trace_memory:
+            import tracemalloc
+
+            tracemalloc.stop()
+        os.chdir(cwd)
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return {"rows": rows, "stages": stages, "text_caches": dish_card.text_cache_info()}
+
+
+def benchmark_isolated(*args, **kwargs):
+    """Run benchmark() in a fresh process and return its result"""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(benchmark, *args, **kwargs).result()
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_generator_options(subparser):
+        subparser.add_argument("--seed", type=int, default=0)
+        subparser.add_argument(
+            "--field-length",
+            type=int,
+            default=6,
+            help="mean number of words in free-text answers (default: 6)",
+        )
+        subparser.add_argument(
+            "--emoji-density",
+            type=float,
+            default=0.5,
+            help="share of answers with a dietary emoji (default: 0.5)",
+        )
+        subparser.add_argument(
+            "--dish-types",
+            type=json.loads,
+            default=None,
+            help='dish type weights as JSON, e.g. \'{"Main course": 3, "Soup": 1}\'',
+        )
+        subparser.add_argument(
+            "--outlet-ratio",
+            type=float,
+            default=0.2,
+            help="share of dishes needing an outlet (default: 0.2)",
+        )
+
+    generate = commands.add_parser("generate", help="write a synthetic CSV")
+    generate.add_argument("path")
+    generate.add_argument("--rows", type=int, default=100)
+    add_generator_options(generate)
+
+    run = commands.add_parser("run", help="run the benchmark suite")
+    run.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000],
+        help="submission counts to benchmark (default: 10 100 1000)",
+    )
+    run.add_argument(
+        "--card-limit",
+        type=int,
+        default=1000,
+        help="maximum number of cards rendered per size (default: 1000)",
+    )
+    run.add_argument("--menu-columns", type=int, choices=[1, 2, 3], default=1)
+    run.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="also record the peak Python allocations of every stage with "
+        "tracemalloc, which slows the stages down",
+    )
+    run.add_argument(
+        "--output",
+        default="benchmark_results.json",
+        help="JSON file for the results (default: benchmark_results.json)",
+    )
+    add_generator_options(run)
+    args = parser.parse_args(argv)
+
+    generator_options = {
+        "seed": args.seed,
+        "field_length": args.field_length,
+        "emoji_density": args.emoji_density,
+        "dish_types": args.dish_types,
+        "outlet_ratio": args.outlet_ratio,
+    }
+
+    if args.command == "generate":
+        generate_csv(args.path, args.rows, **generator_options)
+        print(f"Wrote {args.rows} synthetic submissions to {args.path}")
+        return 0
+
+    runs = []
+    for rows in args.rows:
+        print(f"Benchmarking {rows} submissions")
+        result = benchmark_isolated(
+            rows,
+            args.card_limit,
+            args.menu_columns,
+            args.trace_memory,
+            **generator_options,
+        )
+        for stage in result["stages"]:
+            print(
+                f"  {stage['stage']:<24}{stage['seconds']:>10.3f} s"
+                f"{stage['items_per_second'] or 0:>12.1f} items/s"
+                f"{stage['peak_rss_mb'] or 0:>10.1f} MB"
+                f"{stage['rss_growth_mb'] or 0:>+8.1f} MB"
+            )
+        runs.append(result)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "generator": generator_options,
+        "runs": runs,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote results to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,105 +1,625 @@
+"""Generate PDF dish cards, a menu and signs for the Heritage Fest dinner.
+
+The module can be imported as a library without side effects::
+
+    import dish_card
+
+    dishes = dish_card.load_dishes("hf26.csv")
+    dish_card.render_cards(dishes)
+    dish_card.render_menu(dishes)
+    dish_card.render_signs()
+
+reportlab and Pillow are imported lazily by the stages that need them, so
+importing the module for validation or table assignment is cheap.
+"""
+
 from __future__ import unicode_literals
-import pandas as pd
 import os
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.lib.colors import black, Color
-from reportlab.lib.units import inch
-from PIL import Image
+import argparse
+import codecs
+import csv
 import sys
 import re
-
-# Colors
-NAVY_BLUE = Color(0.0, 0.12, 0.36)  # Dark blue color
-ORANGE = Color(1.0, 0.5, 0.0)  # Orange color
+import math
+import json
+import hashlib
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from dataclasses import astuple, dataclass
+from functools import lru_cache
+
+# Colors (RGB tuples, accepted directly by reportlab's setFillColor)
+NAVY_BLUE = (0.0, 0.12, 0.36)  # Dark blue color
+ORANGE = (1.0, 0.5, 0.0)  # Orange color
+
+# Page size in points, same as reportlab.lib.pagesizes.letter
+letter = (612.0, 792.0)
+landscape = (letter[1], letter[0])  # Swap width and height for landscape
+
+# Text of the direction signs printed after the table signs
+direction_signs = ["ENTER", "EXIT"]
 
 # Path to your CSV file
 csv_file = "hf26.csv"
 logo_path = "heritage_fest.png"
+qr_code_path = "menu_qr.png"
+
+# URL the menu QR code points to. When set, the QR code is generated as
+# vector graphics; otherwise signs fall back to the qr_code_path image
+menu_url = None
+# Also print the menu QR code on every dish card (needs menu_url)
+card_qr = False
+
+# Bump whenever the layout of cards, menu or signs changes so that incremental
+# builds re-render outputs that were made with the old layout
+TEMPLATE_VERSION = 6
+
+# Content hashes of the last build, used to skip unchanged outputs
+manifest_path = ".dish_card_manifest.json"
+
+# Resolution that cached images are downscaled to; None keeps full resolution
+print_dpi = 300
+
+# Order of the menu sections; other dish types follow alphabetically
+type_order = ["Appetizer", "Salad", "Main course", "Dessert", "Drink"]
 
 # Column names from the actual CSV
 dish_column = "Name of the dish:"
-desc_columns = [
-    "Represented cuisine:",
-    "Type of the dish:",
-    "Ingredients:",
-    "Protein/Category:",
-    "Allergens:",  # Simplified allergen title
-]
+# Description columns printed on the cards, with their Dish attribute
+desc_columns = {
+    "Represented cuisine:": "cuisine",
+    "Type of the dish:": "dish_type",
+    "Ingredients:": "ingredients",
+    "Protein/Category:": "protein",
+    "Allergens:": "allergens",  # Simplified allergen title
+}
 provider_column = "Provided by:"
 outlet_column = "Do you need an electrical outlet?"
 special_notes_column = "If you have any special note, you can write below."
 
-# Try reading the CSV file with different encodings
-encodings = ["utf-8", "utf-8-sig", "utf-16"]
-df = None
-for encoding in encodings:
-    try:
-        df = pd.read_csv(csv_file, encoding=encoding)
-        print(f"Successfully read CSV with {encoding} encoding")
-        break
-    except UnicodeDecodeError:
-        continue
+# Dietary emojis the form appends to answers, with their meaning
+dietary_emojis = {
+    "🌙": "Halal",
+    "✡️": "Kosher",
+    "🥦": "Vegetarian",
+    "🐖": "Pork",
+    "🐔": "Poultry",
+    "🐄": "Beef",
+    "🌱": "Vegan",
+}
+
+# Answers the form appends dietary emojis to; emojis in other cells, such
+# as the free-text notes, are not read as tags
+tag_columns = ["Represented cuisine:", "Protein/Category:"]
+
+# Allergens recognized in the Allergens answer, with the words naming them.
+# Longer terms win, so "peanut butter" is nuts and not dairy
+allergen_terms = {
+    "gluten": ["gluten", "wheat", "barley", "rye", "flour"],
+    "dairy": ["dairy", "milk", "lactose", "cheese", "butter", "cream", "yogurt"],
+    "egg": ["egg", "eggs"],
+    "soy": ["soy", "soya", "soybean", "soybeans", "tofu"],
+    "sesame": ["sesame", "tahini"],
+    "shellfish": ["shellfish", "shrimp", "prawn", "prawns", "crab", "lobster"],
+    "fish": ["fish"],
+    "nuts": [
+        "nut",
+        "nuts",
+        "peanut",
+        "peanuts",
+        "almond",
+        "almonds",
+        "walnut",
+        "peanut butter",
+        "almond butter",
+        "almond milk",
+    ],
+    "mustard": ["mustard"],
+    "celery": ["celery"],
+    "sulphites": ["sulphites", "sulfites"],
+}
+
+# Filtered menus made with --diet-menus, as (required tags, excluded tags).
+# Tags are dietary tags or allergens; "*" excludes dishes with any allergen
+diet_menus = {
+    "vegetarian": (("Vegetarian",), ()),
+    "vegan": (("Vegan",), ()),
+    "halal": (("Halal",), ()),
+    "kosher": (("Kosher",), ()),
+    "allergen-free": ((), ("*",)),
+}
+
+# Form questions that are shortened when the CSV is read
+column_renames = {
+    "Allergen (Nuts are not allowed, see ACS allergy policy):": "Allergens:"
+}
+
+# Output folder for the individual dish cards
+output_dir = "dish_cards"
 
-if df is None:
-    print("Error: Could not read CSV file with any of the attempted encodings")
-    sys.exit(1)
+# No need to register fonts - using built-in ReportLab fonts
 
-# Rename the allergen column in the dataframe
-df = df.rename(
-    columns={"Allergen (Nuts are not allowed, see ACS allergy policy):": "Allergens:"}
-)
 
-# Create an output folder for the dish cards if it doesn't exist
-output_dir = "dish_cards"
-os.makedirs(output_dir, exist_ok=True)
+class Metrics:
+    """Wall and CPU time per stage and per card, plus event counters"""
+
+    def __init__(self, trace_memory=False):
+        self.stages = {}
+        self.cards = []
+        self.counts = Counter()
+        self.trace_memory = trace_memory
+        self.text_cache_start = text_cache_info()
+        if trace_memory:
+            import tracemalloc
+
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name):
+        """Accumulate the time spent in the body under stage name"""
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            totals = self.stages.setdefault(
+                name, {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0}
+            )
+            totals["calls"] += 1
+            totals["wall_seconds"] += time.perf_counter() - wall
+            totals["cpu_seconds"] += time.process_time() - cpu
+            if self.trace_memory:
+                import tracemalloc
+
+                peak = tracemalloc.get_traced_memory()[1]
+                totals["peak_traced_bytes"] = max(
+                    peak, totals.get("peak_traced_bytes", 0)
+                )
+
+    def report(self):
+        """Return the collected metrics as a JSON-serialisable dict"""
+        # counts already holds the text cache calls of worker processes
+        counts = Counter(self.counts)
+        for name, info in text_cache_info().items():
+            start = self.text_cache_start[name]
+            hits = info["hits"] - start["hits"]
+            misses = info["misses"] - start["misses"]
+            counts[f"{name}_calls"] += hits + misses
+            counts[f"{name}_cache_misses"] += misses
+        counts = dict(counts)
+        cards = sorted(self.cards)
+        return {
+            "stages": self.stages,
+            "counts": counts,
+            "cards": [
+                {"card": idx + 1, "wall_seconds": wall, "cpu_seconds": cpu}
+                for idx, wall, cpu in cards
+            ],
+        }
+
+    def summary(self):
+        """Return a short text table of the stage timings"""
+        lines = [f"{'stage':<16}{'calls':>8}{'wall s':>10}{'cpu s':>10}"]
+        for name, totals in self.stages.items():
+            lines.append(
+                f"{name:<16}{totals['calls']:>8}"
+                f"{totals['wall_seconds']:>10.3f}{totals['cpu_seconds']:>10.3f}"
+            )
+        if self.cards:
+            walls = sorted(wall for _, wall, _ in self.cards)
+            lines.append(
+                f"cards: {len(walls)}, median {walls[len(walls) // 2] * 1000:.1f} ms,"
+                f" slowest {walls[-1] * 1000:.1f} ms"
+            )
+        lines.extend(
+            f"{event}: {n}" for event, n in sorted(self.report()["counts"].items())
+        )
+        return "\n".join(lines)
+
+
+# Metrics of the current run; None (the default) keeps instrumentation to a
+# single check per event
+_metrics = None
 
-# No need to register fonts - using built-in ReportLab fonts
+
+def enable_profiling(trace_memory=False):
+    """Start collecting metrics for this process and return the collector"""
+    global _metrics
+    _metrics = Metrics(trace_memory)
+    return _metrics
+
+
+def profile_stage(name):
+    """Context manager timing its body as stage name when profiling"""
+    return nullcontext() if _metrics is None else _metrics.stage(name)
+
+
+def count(event, n=1):
+    """Count an event when profiling"""
+    if _metrics is not None:
+        _metrics.counts[event] += n
+
+
+def counter_snapshot():
+    """Event counts and text cache calls of this process so far"""
+    counts = Counter(_metrics.counts)
+    for name, info in text_cache_info().items():
+        counts[f"{name}_calls"] += info["hits"] + info["misses"]
+        counts[f"{name}_cache_misses"] += info["misses"]
+    return counts
+
+
+def _counted(func, *args):
+    """Worker entry point: return (func(*args), counts)
+
+    counts is what the call added to the counters of this worker process,
+    or None when not profiling; the parent adds it with merge_counts().
+    """
+    if _metrics is None:
+        return func(*args), None
+    before = counter_snapshot()
+    result = func(*args)
+    return result, counter_snapshot() - before
+
+
+def merge_counts(counts):
+    """Add counts returned by _counted() in a worker to this process"""
+    if counts and _metrics is not None:
+        _metrics.counts.update(counts)
+
+
+def detect_encoding(path):
+    """Detect the encoding of a CSV file from its first bytes"""
+    with open(path, "rb") as f:
+        head = f.read(1 << 16)
+
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    try:
+        # final=False tolerates a character cut in half at the end of the sample
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+    except UnicodeDecodeError:
+        raise ValueError(f"Could not detect the encoding of {path}") from None
+    return "utf-8"
+
+
+def iter_dishes(path=csv_file, encoding=None):
+    """Yield one record dict per submission, reading the CSV row by row
+
+    Empty cells become None and long form questions are renamed according to
+    column_renames.
+    """
+    encoding = encoding or detect_encoding(path)
+    with open(path, encoding=encoding, newline="") as f:
+        reader = csv.reader(f)
+        header = [column_renames.get(name, name) for name in next(reader, [])]
+        for values in reader:
+            if not any(values):
+                continue  # Skip blank lines
+            values += [""] * (len(header) - len(values))
+            yield {name: (value or None) for name, value in zip(header, values)}
+
+
+class DishCSV:
+    """Dish submissions read from a CSV file
+
+    The file is read, decoded and normalized once, on first use. Iterating
+    yields the same Dish for every row of iter_dishes() on every pass, so
+    the hashing, card, menu and sign passes of a run share one parse.
+    Seating has to see every row anyway, so the dishes are kept in memory.
+    """
+
+    def __init__(self, path, tables=None):
+        self.path = path
+        self.encoding = detect_encoding(path)
+        self.tables = tables or default_tables
+        self._dishes = None
+
+    def _scan(self):
+        # One pass over the raw rows for the dishes, their seating and the
+        # dietary index; the tags have to be read before emojis are removed
+        with profile_stage("csv_parse"):
+            records = []
+            tags = []
+            for record in iter_dishes(self.path, self.encoding):
+                records.append(clean_record(record))
+                tags.append(dish_tags(record))
+            self._assignment = assign_tables(map(dish_seat, records), self.tables)
+            self._diet_index = DietIndex(tags)
+            self._dishes = list(map(Dish.from_record, records, self._assignment))
+
+    def assignment(self):
+        """Table number of every row under the table plan"""
+        if self._dishes is None:
+            self._scan()
+        return self._assignment
+
+    def diet_index(self):
+        """DietIndex of the dietary tags and allergens of every row"""
+        if self._dishes is None:
+            self._scan()
+        return self._diet_index
+
+    def __iter__(self):
+        if self._dishes is None:
+            self._scan()
+        return iter(self._dishes)
+
+    def __len__(self):
+        if self._dishes is None:
+            self._scan()
+        return len(self._dishes)
+
+
+def load_dishes(path=csv_file, tables=None):
+    """Read and parse the dish submissions CSV
+
+    Dishes are seated according to tables, a table plan as returned by
+    load_table_plan(), or default_tables. The whole file is parsed here, so
+    a decode error anywhere in it raises before success is reported.
+    """
+    dishes = DishCSV(path, tables)
+    count = len(dishes)
+    print(f"Successfully read {count} dishes from CSV with {dishes.encoding} encoding")
+    return dishes
+
+
+# Matches a dietary emoji together with the space in front of it
+_emoji_pattern = re.compile("|".join(" " + re.escape(e) for e in dietary_emojis))
 
 
 def remove_emojis(text):
     """Remove specific food and dietary emojis from text"""
-    # Create a mapping of emojis to their text representations
-    emoji_map = {
-        " 🌙": "(Halal)",
-        " ✡️": "(Kosher)",
-        " 🥦": "(Vegetarian)",
-        " 🐖": "(Pork)",
-        " 🐔": "(Poultry)",
-        " 🐄": "(Beef)",
-        " 🌱": "(Vegan)",
+    return _emoji_pattern.sub("", str(text)).strip()
+
+
+@dataclass(frozen=True)
+class Dish:
+    """One normalized dish submission, as drawn on cards, menu and signs"""
+
+    __slots__ = (
+        "name",
+        "provider",
+        "cuisine",
+        "dish_type",
+        "ingredients",
+        "protein",
+        "allergens",
+        "needs_outlet",
+        "notes",
+        "table",
+    )
+
+    name: str
+    provider: str
+    cuisine: str
+    dish_type: str
+    ingredients: str
+    protein: str
+    allergens: str
+    needs_outlet: bool
+    notes: str
+    table: int
+
+    def __reduce__(self):
+        # Frozen slotted instances need an explicit recipe to be pickled,
+        # which is how they travel to worker processes
+        return (Dish, tuple(getattr(self, field) for field in self.__slots__))
+
+    @classmethod
+    def from_record(cls, record, table=None):
+        """Build a Dish from a cleaned CSV record dict
+
+        table is the table number assign_tables() seated the dish at.
+        """
+        details = {field: record.get(column) for column, field in desc_columns.items()}
+        return cls(
+            name=record.get(dish_column),
+            provider=record.get(provider_column),
+            needs_outlet=dish_seat(record)[1],
+            notes=record.get(special_notes_column),
+            table=table,
+            **details,
+        )
+
+
+def clean_record(record):
+    """Return record with emojis removed and whitespace stripped from every
+    text cell; cells left empty become None"""
+    return {
+        column: (remove_emojis(value) or None) if isinstance(value, str) else value
+        for column, value in record.items()
     }
 
-    # Replace each emoji with its text representation or remove it
-    result = str(text)
-    for emoji, replacement in emoji_map.items():
-        result = result.replace(emoji, "")  # Just remove the emoji without replacement
 
-    return result.strip()
+def dish_seat(record):
+    """(dish type, needs outlet) of a cleaned CSV record, for assign_tables()"""
+    outlet = record.get(outlet_column)
+    return record.get("Type of the dish:"), str(outlet).lower() == "yes"
+
+
+def normalize_dishes(records, tables=None):
+    """Clean every text cell once and build Dish records
+
+    Renderers can draw the values as they are. tables gives the table number
+    of every record, as returned by assign_tables(). Without it the records
+    are seated by assign_tables() under default_tables, which needs all of
+    them in memory first.
+    """
+    records = map(clean_record, records)
+    if tables is None:
+        records = list(records)
+        tables = assign_tables(map(dish_seat, records))
+    for record, table in zip(records, tables):
+        yield Dish.from_record(record, table)
+
+
+# A negation right in front of a tag or allergen, as in "Non-Vegetarian",
+# "no dairy" or "not vegan"
+_negation = r"(?:\b(?:non|not|no|without|free\s+of)[\s-]*)?"
+# Dietary emojis and the tag names spelled out, each optionally negated
+_tag_pattern = re.compile(
+    f"({_negation})("
+    + "|".join(re.escape(e.replace("\ufe0f", "")) + "\ufe0f?" for e in dietary_emojis)
+    + r"|\b(?:"
+    + "|".join(dietary_emojis.values())
+    + r")\b)",
+    re.IGNORECASE,
+)
+_tag_names = {
+    e.replace("\ufe0f", ""): name.lower() for e, name in dietary_emojis.items()
+}
+_tag_names.update((name.lower(), name.lower()) for name in dietary_emojis.values())
+
+_allergen_names = {
+    word: allergen for allergen, words in allergen_terms.items() for word in words
+}
+_allergen_pattern = re.compile(
+    f"({_negation})\\b("
+    + "|".join(
+        re.escape(term).replace("\\ ", r"\s+")
+        for term in sorted(_allergen_names, key=len, reverse=True)
+    )
+    + r")\b(-free|\s+free)?",
+    re.IGNORECASE,
+)
+# Words that may surround the allergens without naming one
+_allergen_filler = set(
+    "none n a na no nil contains contain may might traces trace of and or with "
+    "some free allergen allergens".split()
+)
+
+
+def dish_tags(record):
+    """Return the lowercase dietary tags and allergens of a raw CSV record
+
+    Dietary tags are read from the emojis and tag names in the tag_columns
+    answers, skipping negated ones like "Non-Vegetarian"; vegan dishes are
+    also vegetarian. Allergens are the allergen_terms named in the Allergens
+    answer, again skipping negated ones like "dairy-free". Any other word
+    left in that answer is recorded as the "other" allergen, so dishes with
+    an allergen that is not recognized never count as allergen free. Returns
+    a pair of frozensets (tags, allergens).
+    """
+    tags = set()
+    for column in tag_columns:
+        for negation, tag in _tag_pattern.findall(record.get(column) or ""):
+            if not negation:
+                tags.add(_tag_names[tag.replace("\ufe0f", "").lower()])
+    if "vegan" in tags:
+        tags.add("vegetarian")
+
+    answer = remove_emojis(record.get("Allergens:") or "")
+    allergens = set()
+    for negation, word, free in _allergen_pattern.findall(answer):
+        if not negation and not free:
+            allergens.add(_allergen_names[" ".join(word.lower().split())])
+    rest = set(re.findall(r"[a-z]+", _allergen_pattern.sub(" ", answer.lower())))
+    if rest - _allergen_filler:
+        allergens.add("other")
+    return frozenset(tags), frozenset(allergens)
+
+
+class DietIndex:
+    """Bitsets over dish positions for every dietary tag and allergen
+
+    Bit i of a tag's bitset is set when the i-th dish has the tag, so a
+    filter like "vegan and no sesame" is a few integer operations for all
+    dishes at once, and whether a dish passes is a constant-time lookup.
+    """
+
+    def __init__(self, dish_tags):
+        """dish_tags is a (tags, allergens) pair per dish, from dish_tags()"""
+        positions = {}
+        self.allergens = set()
+        self.count = 0
+        for idx, (tags, allergens) in enumerate(dish_tags):
+            self.count += 1
+            self.allergens.update(allergens)
+            for tag in tags | allergens:
+                positions.setdefault(tag, []).append(idx)
+
+        self.bits = {}
+        for tag, indexes in positions.items():
+            bitmap = bytearray(self.count // 8 + 1)
+            for idx in indexes:
+                bitmap[idx >> 3] |= 1 << (idx & 7)
+            self.bits[tag] = int.from_bytes(bitmap, "little")
+
+    def query(self, include=(), exclude=()):
+        """Bitset of the dishes with every tag in include and none in exclude
+
+        Tags are case-insensitive and allergens may be named by any of their
+        allergen_terms, e.g. "Eggs" or "milk"; "*" in exclude stands for any
+        allergen.
+        """
+        mask = (1 << self.count) - 1
+        for tag in include:
+            mask &= self.bits.get(self._name(tag), 0)
+        for tag in exclude:
+            tags = self.allergens if tag == "*" else [self._name(tag)]
+            for name in tags:
+                mask &= ~self.bits.get(name, 0)
+        return mask
+
+    @staticmethod
+    def _name(tag):
+        tag = tag.lower()
+        return _allergen_names.get(tag, tag)
+
+    def members(self, mask):
+        """Return a string whose i-th character is "1" if dish i is in mask"""
+        return format(mask, f"0{self.count}b")[::-1] if self.count else ""
+
+
+def parse_menu_filter(spec):
+    """Parse NAME=TAG,-TAG,... into (name, (required tags, excluded tags))"""
+    name, _, terms = spec.partition("=")
+    terms = [term.strip() for term in terms.split(",") if term.strip()]
+    if not name.strip() or not terms:
+        raise ValueError(f"expected NAME=TAG,-TAG,... but got {spec!r}")
+    include = tuple(term for term in terms if not term.startswith("-"))
+    exclude = tuple(term[1:] for term in terms if term.startswith("-"))
+    return name.strip(), (include, exclude)
+
+
+def menu_variants(dishes, index, filters):
+    """Split dishes into every filtered menu in one pass
+
+    filters maps a menu name to (required tags, excluded tags), as in
+    diet_menus. Returns {name: [dishes]}.
+    """
+    selected = {
+        name: index.members(index.query(include, exclude))
+        for name, (include, exclude) in filters.items()
+    }
+    variants = {name: [] for name in filters}
+    for idx, dish in enumerate(dishes):
+        for name, members in selected.items():
+            if members[idx] == "1":
+                variants[name].append(dish)
+    return variants
 
 
-def draw_text(canvas_obj, text, x, y, font_name, font_size, max_width=None):
-    """Draw text with clean formatting"""
-    canvas_obj.setFont(font_name, font_size)
-    clean_text = remove_emojis(text).strip()
-    if max_width is None:
-        canvas_obj.drawString(x, y, clean_text)
-        return canvas_obj.stringWidth(clean_text, font_name, font_size)
-    return 0
+@lru_cache(maxsize=16384)
+def string_width(text, font_name, font_size):
+    """Width of text in points, from the font's glyph-width tables (cached)"""
+    from reportlab.pdfbase.pdfmetrics import stringWidth
 
+    return stringWidth(text, font_name, font_size)
 
-def wrap_text(text, font_name, font_size, max_width, canvas_obj):
-    """Helper function to wrap text"""
-    clean_text = remove_emojis(text).strip()
-    words = clean_text.split()
+
+@lru_cache(maxsize=4096)
+def _wrap_lines(text, font_name, font_size, max_width):
+    """Greedy word wrap, cached per layout"""
     lines = []
     current_line = []
     current_width = 0
 
-    for word in words:
-        word_width = canvas_obj.stringWidth(word + " ", font_name, font_size)
+    for word in text.split():
+        word_width = string_width(word + " ", font_name, font_size)
         if current_width + word_width <= max_width:
             current_line.append(word)
             current_width += word_width
@@ -112,36 +632,342 @@ def wrap_text(text, font_name, font_size, max_width, canvas_obj):
     if current_line:
         lines.append(" ".join(current_line))
 
-    return lines
+    return tuple(lines)
+
 
+def text_cache_info():
+    """Hit/miss counters of the text measurement and wrapping caches"""
+    return {
+        "string_width": string_width.cache_info()._asdict(),
+        "wrap_text": _wrap_lines.cache_info()._asdict(),
+    }
 
-def get_table_number(dish_type, needs_outlet):
-    """Assign table number based on dish type and outlet requirement"""
-    # Convert to string and lowercase for consistent comparison
-    dish_type = str(dish_type).lower().strip()
-    needs_outlet = str(needs_outlet).lower().strip()
 
-    # Table 3 for dishes requiring outlet or desserts/drinks
-    if needs_outlet == "yes" or dish_type in ["dessert", "drink"]:
-        return 3
-    # Table 1 for appetizers
-    elif dish_type == "appetizer":
-        return 1
-    # Table 2 for salads and main courses
-    elif dish_type in ["salad", "main course"]:
-        return 2
-    # Default to table 3 if type is unknown
-    else:
-        return 3
+def draw_text(canvas_obj, text, x, y, font_name, font_size, max_width=None):
+    """Draw text with clean formatting"""
+    canvas_obj.setFont(font_name, font_size)
+    if max_width is None:
+        canvas_obj.drawString(x, y, text)
+        return string_width(text, font_name, font_size)
+    return 0
 
 
-def create_dish_card(row, idx):
-    # Create PDF with letter size
-    output_path = os.path.join(output_dir, f"dish_card_{idx+1}.pdf")
-    c = canvas.Canvas(output_path, pagesize=letter)
-    width, height = letter
+def wrap_text(text, font_name, font_size, max_width):
+    """Helper function to wrap text"""
+    return list(_wrap_lines(text, font_name, font_size, max_width))
 
-    # Set margins and initial position
+
+# Decoded images shared by all drawing functions, see get_image()
+_image_cache = {}
+
+
+def get_image(path, printed_height=None):
+    """Return a cached (ImageReader, aspect) pair for the image at path
+
+    Each image is decoded once per modification time. When printed_height (in
+    points) is given, the image is downscaled to print_dpi at that height so
+    high-resolution logos are not carried through every page at full size.
+    """
+    key = (path, os.path.getmtime(path), printed_height)
+    cached = _image_cache.get(key)
+    if cached is None:
+        count("image_decode")
+        from PIL import Image
+        from reportlab.lib.utils import ImageReader
+
+        img = Image.open(path)
+        img.load()
+        aspect = img.width / img.height
+        if printed_height and print_dpi:
+            target_height = math.ceil(printed_height / 72 * print_dpi)
+            if img.height > target_height:
+                target_width = max(1, round(target_height * aspect))
+                img = img.resize((target_width, target_height), Image.LANCZOS)
+        cached = (ImageReader(img), aspect)
+        _image_cache[key] = cached
+    return cached
+
+
+def configure_qr(url, on_cards=False):
+    """Set the menu_url the QR codes point to and whether cards show it"""
+    global menu_url, card_qr
+    menu_url = url or None
+    card_qr = bool(on_cards)
+
+
+def render_settings():
+    """Module settings the renderers read, as passed to worker processes"""
+    return {
+        "logo_path": logo_path,
+        "qr_code_path": qr_code_path,
+        "menu_url": menu_url,
+        "card_qr": card_qr,
+        "profiling": _metrics is not None,
+    }
+
+
+def apply_render_settings(settings):
+    """Adopt settings from render_settings() of the parent process
+
+    Worker processes only inherit module globals under the fork start
+    method, so every pool runs this as its initializer.
+    """
+    global logo_path, qr_code_path
+    logo_path = settings["logo_path"]
+    qr_code_path = settings["qr_code_path"]
+    configure_qr(settings["menu_url"], settings["card_qr"])
+    if settings["profiling"] and _metrics is None:
+        enable_profiling()
+
+
+def worker_pool(workers):
+    """Process pool whose workers render with the current settings"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=apply_render_settings,
+        initargs=(render_settings(),),
+    )
+
+
+def qr_source():
+    """What the menu QR code is drawn from, for content hashes"""
+    return menu_url or file_hash(qr_code_path)
+
+
+@lru_cache(maxsize=16)
+def qr_matrix(url):
+    """Return (module count, dark runs) of the QR code encoding url
+
+    Runs are (row, column, length) of horizontally adjacent dark modules.
+    Encoding is cached per URL, so it happens once however many pages or
+    documents show the code.
+    """
+    from itertools import groupby
+    from reportlab.graphics.barcode.qr import QrCodeWidget
+
+    code = QrCodeWidget(url, barLevel="M").qr
+    code.make()
+    runs = []
+    for row, modules in enumerate(code.modules):
+        column = 0
+        for dark, group in groupby(map(bool, modules)):
+            length = len(list(group))
+            if dark:
+                runs.append((row, column, length))
+            column += length
+    return code.getModuleCount(), tuple(runs)
+
+
+def draw_menu_qr(c, x, y, size):
+    """Draw the QR code for menu_url as a size x size square at (x, y)
+
+    The code is a vector form, quiet zone included, defined once per
+    document and URL and referenced wherever it is shown. Returns False
+    without drawing anything if no menu_url is set.
+    """
+    if not menu_url:
+        return False
+    count, runs = qr_matrix(menu_url)
+    side = count + 8  # Four modules of quiet zone on each side
+    name = "menu_qr_" + hashlib.sha1(menu_url.encode("utf-8")).hexdigest()[:12]
+    if not c.hasForm(name):
+        c.beginForm(name, upperx=side, uppery=side)
+        c.setFillColor("black")
+        modules = c.beginPath()
+        for row, column, length in runs:
+            modules.rect(column + 4, side - 5 - row, length, 1)
+        c.drawPath(modules, stroke=0, fill=1)
+        c.endForm()
+    c.saveState()
+    c.translate(x, y)
+    c.scale(size / side, size / side)
+    c.doForm(name)
+    c.restoreState()
+    return True
+
+
+@dataclass(frozen=True)
+class Table:
+    """One serving table of the table plan
+
+    capacity is the number of dishes the table holds and outlets the number
+    of those that can be plugged in, None meaning no limit. types lists the
+    dish types the table is meant for, if any; "*" stands for every type no
+    other table of the plan lists.
+    """
+
+    number: int
+    capacity: int = None
+    outlets: int = 0
+    types: tuple = ()
+
+
+# The original fixed seating: appetizers, salads and main courses, and
+# desserts, drinks, other types and dishes needing an outlet at the only
+# table with outlets
+default_tables = (
+    Table(1, types=("Appetizer",)),
+    Table(2, types=("Salad", "Main course")),
+    Table(3, outlets=None, types=("Dessert", "Drink", "*")),
+)
+
+
+def table_summary(dishes):
+    """One line with the number of dishes seated at each table of the plan"""
+    seated = Counter(dishes.assignment())
+    parts = []
+    for table in dishes.tables:
+        part = f"table {table.number}: {seated[table.number]}"
+        if table.capacity is not None:
+            part += f"/{table.capacity}"
+        parts.append(part)
+    return "Dishes per table: " + ", ".join(parts)
+
+
+def load_table_plan(path):
+    """Read a table plan from a JSON list of tables, e.g.
+
+    [{"number": 1, "capacity": 20, "outlets": 2, "types": ["Appetizer"]}]
+
+    Every key is optional; number defaults to the position in the list.
+    """
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path}: a table plan is a non-empty list of tables")
+
+    def limit(value):
+        if value is None:
+            return None
+        if int(value) < 0:
+            raise ValueError(f"negative limit {value}")
+        return int(value)
+
+    tables = []
+    for position, entry in enumerate(entries, 1):
+        try:
+            types = entry.get("types", ())
+            tables.append(
+                Table(
+                    number=int(entry.get("number", position)),
+                    capacity=limit(entry.get("capacity")),
+                    outlets=limit(entry.get("outlets", 0)),
+                    types=(types,) if isinstance(types, str) else tuple(types),
+                )
+            )
+        except (AttributeError, TypeError, ValueError) as exc:
+            raise ValueError(f"{path}: invalid table {position}: {exc}") from None
+
+    numbers = [table.number for table in tables]
+    if len(set(numbers)) != len(numbers):
+        raise ValueError(f"{path}: table numbers must be unique")
+    return tuple(tables)
+
+
+def assign_tables(dishes, tables=default_tables):
+    """Seat (dish type, needs outlet) pairs and return their table numbers
+
+    A greedy balancer: dishes needing an outlet go first since they have the
+    fewest options, then dishes with a table meant for their type, then the
+    rest. Each dish goes to the least full of the tables that still have
+    room for it, preferring tables meant for its type. That is O(dishes x
+    tables) and keeps every table evenly loaded. Dishes that fit nowhere
+    are put on the least full table anyway and reported as a warning.
+    """
+    dishes = [
+        (str(dish_type or "").strip().lower(), bool(outlet))
+        for dish_type, outlet in dishes
+    ]
+    table_types = [{name.lower() for name in table.types} for table in tables]
+    listed = set().union(*table_types)
+
+    def preferred_by(k, dish_type):
+        types = table_types[k]
+        return dish_type in types or ("*" in types and dish_type not in listed)
+
+    loads = [0] * len(tables)
+    outlet_loads = [0] * len(tables)
+    # Compare fill ratios when every table has a capacity, dish counts otherwise
+    by_ratio = all(table.capacity for table in tables)
+
+    def fullness(k):
+        return (loads[k] / tables[k].capacity if by_ratio else loads[k], k)
+
+    def has_room(k, outlet):
+        table = tables[k]
+        if table.capacity is not None and loads[k] >= table.capacity:
+            return False
+        return not (
+            outlet and table.outlets is not None and outlet_loads[k] >= table.outlets
+        )
+
+    def priority(i):
+        dish_type, outlet = dishes[i]
+        return (
+            not outlet,
+            not any(preferred_by(k, dish_type) for k in range(len(tables))),
+        )
+
+    assignment = [None] * len(dishes)
+    over_capacity = without_outlet = 0
+    for i in sorted(range(len(dishes)), key=priority):
+        dish_type, outlet = dishes[i]
+        candidates = [k for k in range(len(tables)) if has_room(k, outlet)]
+        if not candidates:
+            if outlet and any(has_room(k, False) for k in range(len(tables))):
+                without_outlet += 1
+            else:
+                over_capacity += 1
+            candidates = [k for k in range(len(tables)) if has_room(k, False)]
+            candidates = candidates or list(range(len(tables)))
+        preferred = [k for k in candidates if preferred_by(k, dish_type)]
+        k = min(preferred or candidates, key=fullness)
+        loads[k] += 1
+        outlet_loads[k] += outlet
+        assignment[i] = tables[k].number
+
+    if over_capacity:
+        print(f"Warning: {over_capacity} dishes exceed the table capacities")
+    if without_outlet:
+        print(f"Warning: {without_outlet} dishes need an outlet but none is left")
+    return assignment
+
+
+# Static page elements are drawn once per document as reportlab form XObjects
+# and then only referenced from each page that uses them
+TEMPLATES = {}
+
+
+def template(name, pagesize=letter):
+    """Register a function drawing the static template called name
+
+    pagesize is the page the template is drawn for; it bounds the form, so
+    the template is not clipped when placed on a sheet of another size.
+    """
+
+    def register(draw):
+        TEMPLATES[name] = (draw, pagesize)
+        return draw
+
+    return register
+
+
+def draw_template(c, name):
+    """Reference template name on the current page, defining it on first use"""
+    if not c.hasForm(name):
+        draw, (width, height) = TEMPLATES[name]
+        c.beginForm(name, upperx=width, uppery=height)
+        draw(c)
+        c.endForm()
+    c.doForm(name)
+
+
+@template("card_frame")
+def draw_card_frame(c):
+    """Draw the header band, border and logo shared by all dish cards"""
+    width, height = letter
     margin = 72  # 1 inch in points
     content_width = width - 2 * margin
     header_height = 100  # Increased header height for longer titles
@@ -157,42 +983,299 @@ def create_dish_card(row, idx):
     c.setLineWidth(3)
     c.rect(margin, margin, content_width, height - 2 * margin)
 
-    current_y = height - margin - 40  # Start 20 points from top of header
+    # Add the Heritage Fest logo at the bottom
+    if os.path.exists(logo_path):
+        logo_height = 100
+        logo, aspect = get_image(logo_path, logo_height)
+        logo_width = logo_height * aspect
 
-    # Draw dish name (title) in white
-    c.setFillColor("white")
-    dish_name = str(row[dish_column])
+        # Calculate centered position for logo
+        logo_x = (width - logo_width) / 2
+        logo_y = margin + 10
+
+        # Draw the logo
+        c.drawImage(logo, logo_x, logo_y, width=logo_width, height=logo_height)
+
+    # Menu QR code in the bottom right corner, if enabled
+    if card_qr:
+        qr_size = 72
+        draw_menu_qr(c, width - margin - 10 - qr_size, margin + 10, qr_size)
+
+
+@template("sign_header", landscape)
+def draw_sign_header(c):
+    """Draw the logo and menu QR code shared by all landscape signs"""
+    width, height = landscape
+    margin = 72  # 1 inch in points
+
+    # Draw Heritage Fest logo on the left top
+    if os.path.exists(logo_path):
+        logo_height = 120
+        logo, aspect = get_image(logo_path, logo_height)
+        logo_width = logo_height * aspect
+
+        # Position logo in the top left
+        logo_x = margin
+        logo_y = height - margin - logo_height
+        c.drawImage(logo, logo_x, logo_y, width=logo_width, height=logo_height)
+
+    # Draw QR code on the right top, generated from menu_url or from the
+    # QR image if it exists
+    qr_height = 100
+    qr_y = height - margin - qr_height
+    qr_x = width - margin - qr_height
+    if draw_menu_qr(c, qr_x, qr_y, qr_height):
+        qr_width = qr_height
+    elif os.path.exists(qr_code_path):
+        qr_img, qr_aspect = get_image(qr_code_path, qr_height)
+        qr_width = qr_height * qr_aspect
+
+        # Position QR code in the top right
+        qr_x = width - margin - qr_width
+        c.drawImage(qr_img, qr_x, qr_y, width=qr_width, height=qr_height)
+    else:
+        return  # No QR code, so no caption either
+
+    # Add caption under QR code
+    c.setFont("Helvetica", 10)
+    c.setFillColor(NAVY_BLUE)
+    caption = "scan for the dinner menu"
+    caption_width = string_width(caption, "Helvetica", 10)
+    c.drawString(qr_x + (qr_width - caption_width) / 2, qr_y - 15, caption)
+
+
+def partial_path(path):
+    """Temporary name a PDF is written under before publish() moves it"""
+    return f"{path}.partial"
+
+
+def publish(path):
+    """Atomically replace path with its fully written partial file
+
+    Anyone polling the outputs never picks up a half-written PDF.
+    """
+    os.replace(partial_path(path), path)
+
+
+@contextmanager
+def pdf_canvas(output, pagesize=letter):
+    """Yield a canvas that is saved to output when the block ends
+
+    output is a path, written under partial_path() and published once
+    complete, or any binary file object such as a BytesIO or a socket file.
+    """
+    from reportlab.pdfgen import canvas
+
+    is_path = isinstance(output, (str, os.PathLike))
+    c = canvas.Canvas(partial_path(output) if is_path else output, pagesize=pagesize)
+    yield c
+    with profile_stage("pdf_save"):
+        c.save()
+    if is_path:
+        publish(output)
+
+
+class DirectoryWriter:
+    """Write named outputs as files below root, each published atomically"""
+
+    def __init__(self, root="."):
+        self.root = root
+
+    def path(self, name):
+        return os.path.normpath(os.path.join(self.root, name))
+
+    def exists(self, name):
+        return os.path.exists(self.path(name))
+
+    def write(self, name, data):
+        path = self.path(name)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(partial_path(path), "wb") as f:
+            f.write(data)
+        publish(path)
+
+    def remove(self, name):
+        path = self.path(name)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def close(self):
+        pass
+
+
+class ZipWriter:
+    """Stream every output into a single ZIP archive
+
+    Members are appended in one sequential write, which is much cheaper than
+    many small files on network file systems. The archive is published
+    atomically when closed. It always holds a full build, so nothing in it
+    counts as up to date and nothing needs removing.
+    """
+
+    def __init__(self, path):
+        import zipfile
+
+        self.path = path
+        self.archive = zipfile.ZipFile(partial_path(path), "w", zipfile.ZIP_DEFLATED)
+
+    def exists(self, name):
+        return False
+
+    def write(self, name, data):
+        self.archive.writestr(name, data)
+
+    def remove(self, name):
+        pass
+
+    def close(self):
+        self.archive.close()
+        publish(self.path)
+        print(f"Wrote {self.path}")
+
+
+class ThreadedWriter:
+    """Hand outputs to another writer running on a dedicated thread
+
+    Rendering keeps going while earlier outputs are written. The queue is
+    bounded, so at most max_pending rendered PDFs wait in memory before
+    rendering blocks on the disk. Errors raised by the writer are re-raised
+    on the next write() or on close().
+    """
+
+    def __init__(self, writer, max_pending=32):
+        import queue
+        import threading
+
+        self.writer = writer
+        self.queue = queue.Queue(max_pending)
+        self.error = None
+        self.thread = threading.Thread(
+            target=self._run, name="output-writer", daemon=True
+        )
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            method, args = item
+            if self.error is None:
+                try:
+                    with profile_stage("write"):
+                        getattr(self.writer, method)(*args)
+                except Exception as exc:
+                    self.error = exc
+
+    def _check(self):
+        if self.error is not None:
+            raise self.error
+
+    def exists(self, name):
+        return self.writer.exists(name)
+
+    def write(self, name, data):
+        self._check()
+        self.queue.put(("write", (name, data)))
+
+    def remove(self, name):
+        self._check()
+        self.queue.put(("remove", (name,)))
+
+    def close(self):
+        """Wait for every queued output to be written, then close the writer"""
+        self.queue.put(None)
+        self.thread.join()
+        self._check()
+        self.writer.close()
+
+
+def create_dish_card(dish, idx, output_dir=output_dir):
+    # Create PDF with letter size
+    output_path = os.path.join(output_dir, f"dish_card_{idx+1}.pdf")
+    with pdf_canvas(output_path) as c:
+        draw_dish_card(c, dish)
+
+
+card_title_sizes = [28 - 0.5 * i for i in range(29)]  # 28 down to 14 points
+card_body_sizes = [14 - 0.5 * i for i in range(15)]  # 14 down to 7 points
+
+
+def layout_card_title(dish, title_size=28):
+    """Lay out the dish name in the card header at title_size
+
+    Returns (commands, fits); commands are (x, y, font, size, text, color)
+    tuples as drawn by draw_dish_card().
+    """
+    width, height = letter
+    margin = 72  # 1 inch in points
+    content_width = width - 2 * margin
+    header_height = 100  # Increased header height for longer titles
     title_font = "Helvetica-Bold"
-    title_size = 28
 
-    # Wrap title text
-    title_lines = wrap_text(dish_name, title_font, title_size, content_width - 40, c)
+    # Wrap title text, 30 points per line at the default 28 point size
+    title_lines = wrap_text(
+        str(dish.name or ""), title_font, title_size, content_width - 40
+    )
+    line_height = title_size * 30 / 28
+    title_total_height = len(title_lines) * line_height
 
     # Center title vertically in header
-    title_total_height = len(title_lines) * 30  # 30 points per line
-    title_y = current_y - (header_height - title_total_height) / 2 + 20
+    current_y = height - margin - 40
+    title_y = (
+        current_y - (header_height - title_total_height) / 2 + title_size * 20 / 28
+    )
 
-    # Draw title lines
+    commands = []
+    widest = 0
     for line in title_lines:
-        line_width = c.stringWidth(line, title_font, title_size)
+        line_width = string_width(line, title_font, title_size)
+        widest = max(widest, line_width)
         x = (width - line_width) / 2
-        draw_text(c, line, x, title_y, title_font, title_size)
-        title_y -= 30
+        commands.append((x, title_y, title_font, title_size, line, "white"))
+        title_y -= line_height
+
+    fits = title_total_height <= header_height - 10 and widest <= content_width - 40
+    return commands, fits
+
+
+def layout_card_body(dish, body_size=14, drop_overflow=True):
+    """Lay out everything below the card header at body_size
+
+    Spacing scales with body_size, which is the size of the field values.
+    Returns (commands, overflow) where overflow lists what does not fit above
+    the logo. With drop_overflow, fields that find no room in either column
+    are left out, as on the original cards; otherwise they are laid out
+    past the logo and reported.
+    """
+    width, height = letter
+    margin = 72  # 1 inch in points
+    content_width = width - 2 * margin
+    header_height = 100
+    scale = body_size / 14
+    commands = []
+    overflow = []
+
+    def text(x, y, font_name, font_size, line, color=NAVY_BLUE):
+        commands.append((x, y, font_name, font_size, line, color))
 
     current_y = height - margin - header_height - 40
 
     # Draw provider
-    c.setFillColor(NAVY_BLUE)
-    provider = f"Provided by: {str(row[provider_column])}"
-    provider_lines = wrap_text(provider, "Helvetica-Bold", 18, content_width - 40, c)
-
+    provider = f"Provided by: {dish.provider}"
+    provider_size = 18 * scale
+    provider_lines = wrap_text(
+        provider, "Helvetica-Bold", provider_size, content_width - 40
+    )
     for line in provider_lines:
-        line_width = c.stringWidth(line, "Helvetica-Bold", 18)
+        line_width = string_width(line, "Helvetica-Bold", provider_size)
         x = (width - line_width) / 2
-        draw_text(c, line, x, current_y, "Helvetica-Bold", 18)
-        current_y -= 25
+        text(x, current_y, "Helvetica-Bold", provider_size, line)
+        current_y -= 25 * scale
 
-    current_y -= 20  # Extra space after provider
+    current_y -= 20 * scale  # Extra space after provider
 
     # Calculate space needed for logo
     logo_height = 100
@@ -204,306 +1287,607 @@ def create_dish_card(row, idx):
     right_margin = margin + content_width / 2 + 10
     current_x = left_margin
     original_y = current_y
+    column_ends = []
+    column_full = False
 
     # Draw other information in two columns
-    for i, column in enumerate(desc_columns):
-        if pd.notna(row[column]):
-            # Switch to right column if we're running out of space
-            if current_y < min_y and current_x == left_margin:
-                current_x = right_margin
-                current_y = original_y
-            elif current_y < min_y:
+    fields = [
+        (column, getattr(dish, field))
+        for column, field in desc_columns.items()
+        if getattr(dish, field) is not None
+    ]
+    for position, (column, value) in enumerate(fields):
+        # Switch to right column if we're running out of space
+        if current_y < min_y and current_x == left_margin:
+            column_ends.append(current_y)
+            current_x = right_margin
+            current_y = original_y
+        elif current_y < min_y and not column_full:
+            # Reported once, when both columns first run out of space
+            column_full = True
+            dropped = ", ".join(name.rstrip(":") for name, _ in fields[position:])
+            overflow.append(f"no room for {dropped}")
+            if drop_overflow:
                 break  # Stop if we run out of space in both columns
 
-            # Draw label
-            c.setFillColor(NAVY_BLUE)
-            label = f"{column.replace(':', '')}: "
-            draw_text(c, label, current_x, current_y, "Helvetica-Bold", 14)
-            label_width = c.stringWidth(label, "Helvetica-Bold", 14)
-
-            # Calculate available width for value
-            # Increase the available width by reducing the margins
-            if column == "Ingredients:":
-                # Give more space for ingredients
-                available_width = (
-                    (content_width / 2 - 10)
-                    if current_x == left_margin
-                    else (content_width / 2 - 10)
-                )
-            else:
-                # Standard width for other fields
-                available_width = (
-                    (content_width / 2 - 25)
-                    if current_x == left_margin
-                    else (content_width / 2 - 15)
-                )
+        # Draw label
+        label = f"{column.replace(':', '')}: "
+        text(current_x, current_y, "Helvetica-Bold", body_size, label)
+        label_width = string_width(label, "Helvetica-Bold", body_size)
+
+        # Calculate available width for value
+        # Increase the available width by reducing the margins
+        if column == "Ingredients:":
+            # Give more space for ingredients
+            available_width = content_width / 2 - 10
+        else:
+            # Standard width for other fields
+            available_width = (
+                (content_width / 2 - 25)
+                if current_x == left_margin
+                else (content_width / 2 - 15)
+            )
+
+        # Draw value
+        value_lines = wrap_text(value, "Helvetica", body_size, available_width)
 
-            # Draw value
-            value = str(row[column])
-            value_lines = wrap_text(value, "Helvetica", 14, available_width, c)
+        for line in value_lines:
+            text(current_x + label_width, current_y, "Helvetica", body_size, line)
+            current_y -= 20 * scale
 
-            for line in value_lines:
-                draw_text(c, line, current_x + label_width, current_y, "Helvetica", 14)
-                current_y -= 20
+        current_y -= 10 * scale  # Extra space between fields
 
-            current_y -= 10  # Extra space between fields
+    # Continue below the longer of the two columns
+    current_y = min(column_ends + [current_y])
 
     # Add electrical outlet requirement
-    current_y -= 10  # Extra space before outlet info
-    outlet_needed = str(row[outlet_column]).strip()
+    current_y -= 10 * scale  # Extra space before outlet info
+    outlet_needed = "Yes" if dish.needs_outlet else "No"
     outlet_text = f"Electrical Outlet Required: {outlet_needed}"
-    c.setFillColor(NAVY_BLUE)
     # Left align the outlet text with the same margin as other content
-    draw_text(c, outlet_text, left_margin, current_y, "Helvetica", 12)
-    current_y -= 30  # Space after outlet info
+    text(left_margin, current_y, "Helvetica", 12 * scale, outlet_text)
+    current_y -= 18 * scale
+    text(left_margin, current_y, "Helvetica-Bold", 12 * scale, f"Table: {dish.table}")
+    current_y -= 30 * scale  # Space after outlet info
 
     # Add special notes if they exist
-    if pd.notna(row[special_notes_column]) and str(row[special_notes_column]).strip():
-        current_y -= 10  # Extra space before special notes
-        c.setFillColor(NAVY_BLUE)
-        notes_label = "Special Notes:"
-        draw_text(c, notes_label, left_margin, current_y, "Helvetica-Bold", 12)
-        current_y -= 18
+    if dish.notes is not None:
+        current_y -= 10 * scale  # Extra space before special notes
+        text(left_margin, current_y, "Helvetica-Bold", 12 * scale, "Special Notes:")
+        current_y -= 18 * scale
 
         # Wrap and draw the special notes
-        special_notes = str(row[special_notes_column]).strip()
-        notes_lines = wrap_text(special_notes, "Helvetica", 11, content_width - 40, c)
-
-        c.setFillColor(black)
+        notes_size = 11 * scale
+        notes_lines = wrap_text(dish.notes, "Helvetica", notes_size, content_width - 40)
         for line in notes_lines:
-            draw_text(c, line, left_margin, current_y, "Helvetica", 11)
-            current_y -= 16
+            text(left_margin, current_y, "Helvetica", notes_size, line, "black")
+            current_y -= 16 * scale
+
+    # Anything whose descenders reach the top of the logo overflows
+    logo_top = margin + 10 + logo_height
+    if any(y - size / 4 < logo_top for _, y, _, size, _, _ in commands):
+        overflow.append("text runs into the logo")
+    return commands, overflow
+
+
+def _largest_fitting(sizes, fits):
+    """Binary search descending sizes for the largest one that fits
+
+    Returns the smallest size if none fits.
+    """
+    if fits(sizes[0]):
+        return sizes[0]
+    low, high = 1, len(sizes) - 1
+    while low < high:
+        middle = (low + high) // 2
+        if fits(sizes[middle]):
+            high = middle
+        else:
+            low = middle + 1
+    return sizes[low]
+
+
+def layout_dish_card(dish, fit=False):
+    """Lay out a dish card and return (commands, overflow)
+
+    With fit, the title and body font sizes are binary searched for the
+    largest that fit the header and the two columns above the logo. Each
+    probe only re-measures the text: wrapped lines and string widths come
+    from the text caches, and laid out probes are kept to draw the result.
+    overflow lists whatever still does not fit.
+    """
+    if not fit:
+        title, title_fits = layout_card_title(dish)
+        body, overflow = layout_card_body(dish)
+    else:
+        titles = {}
+        bodies = {}
+
+        def title_at(size):
+            if size not in titles:
+                titles[size] = layout_card_title(dish, size)
+            return titles[size]
+
+        def body_at(size):
+            if size not in bodies:
+                bodies[size] = layout_card_body(dish, size, drop_overflow=False)
+            return bodies[size]
+
+        title_size = _largest_fitting(card_title_sizes, lambda s: title_at(s)[1])
+        body_size = _largest_fitting(card_body_sizes, lambda s: not body_at(s)[1])
+        title, title_fits = title_at(title_size)
+        body, overflow = body_at(body_size)
+
+    if not title_fits:
+        overflow = ["title does not fit the header"] + overflow
+    return title + body, overflow
+
+
+def draw_dish_card(c, dish, fit=False):
+    """Draw a single dish card onto the current page of canvas c
+
+    Returns the overflow of layout_dish_card(), empty if everything fits.
+    """
+    # Header band, border and logo come from the shared template
+    draw_template(c, "card_frame")
+
+    commands, overflow = layout_dish_card(dish, fit)
+    color = None
+    for x, y, font_name, font_size, line, line_color in commands:
+        if line_color != color:
+            c.setFillColor(line_color)
+            color = line_color
+        draw_text(c, line, x, y, font_name, font_size)
+    return overflow
+
+
+def overflow_message(dish, overflow):
+    """One line describing what does not fit on the card of dish, or None"""
+    return f"{dish.name}: {'; '.join(overflow)}" if overflow else None
+
+
+def report_overflow(overflows):
+    """Print the cards that still overflow, given {card number: message}"""
+    if overflows:
+        print(f"{len(overflows)} dish cards overflow:")
+        for number in sorted(overflows):
+            print(f"  card {number}: {overflows[number]}")
+
+
+def create_combined_dish_cards(
+    dishes, output_path="dish_cards.pdf", fit=False, overflows=None
+):
+    """Create all dish cards as pages of a single PDF
+
+    output_path may also be a binary file object. fit and overflows are
+    passed on to draw_combined_dish_cards().
+    """
+    # One canvas for every card: reportlab stores the logo once as a shared
+    # image XObject and each page just references it
+    with pdf_canvas(output_path) as c:
+        draw_combined_dish_cards(c, dishes, fit, overflows)
+    if isinstance(output_path, (str, os.PathLike)):
+        print(f"Created combined dish cards: {output_path}")
+
+
+def draw_combined_dish_cards(c, dishes, fit=False, overflows=None):
+    """Draw every dish card as its own page of canvas c
+
+    Cards are auto-fitted with fit. The overflow of each card that does not
+    fit is recorded in the overflows dict under its card number.
+    """
+    for idx, dish in enumerate(dishes):
+        wall, cpu = time.perf_counter(), time.process_time()
+        message = overflow_message(dish, draw_dish_card(c, dish, fit))
+        if message and overflows is not None:
+            overflows[idx + 1] = message
+        c.showPage()
+        if _metrics is not None:
+            _metrics.cards.append(
+                (idx, time.perf_counter() - wall, time.process_time() - cpu)
+            )
+        print(f"Created dish card {idx + 1}")
 
-        current_y -= 15  # Space after special notes
 
-    # Add the Heritage Fest logo at the bottom
-    if os.path.exists(logo_path):
-        img = Image.open(logo_path)
-        aspect = img.width / img.height
-        logo_width = logo_height * aspect
+# Sheet size, columns and rows for each supported number of cards per sheet
+impositions = {2: (landscape, 2, 1), 4: (letter, 2, 2), 6: (landscape, 3, 2)}
+# Trim box of a card on its letter page: the orange border plus 1/8 inch
+card_trim = (63, 63, 486, 666)
+crop_mark_space = 18  # Room around each card for its crop marks
 
-        # Calculate centered position for logo
-        logo_x = (width - logo_width) / 2
-        logo_y = margin + 10
 
-        # Draw the logo
-        c.drawImage(logo_path, logo_x, logo_y, width=logo_width, height=logo_height)
+def imposition_slots(per_sheet):
+    """Return (sheet size, [(x, y, scale)]) placing card_trim on one sheet
 
-    # Save the page
-    c.save()
+    Each slot's (x, y) is where the bottom-left corner of the scaled trim box
+    lands; slots run left to right, top to bottom.
+    """
+    sheet, columns, rows = impositions[per_sheet]
+    slot_width, slot_height = sheet[0] / columns, sheet[1] / rows
+    trim_width, trim_height = card_trim[2], card_trim[3]
+    scale = min(
+        (slot_width - 2 * crop_mark_space) / trim_width,
+        (slot_height - 2 * crop_mark_space) / trim_height,
+    )
+    slots = []
+    for row in range(rows):
+        for column in range(columns):
+            x = column * slot_width + (slot_width - trim_width * scale) / 2
+            y = sheet[1] - (row + 1) * slot_height
+            y += (slot_height - trim_height * scale) / 2
+            slots.append((x, y, scale))
+    return sheet, slots
+
+
+def draw_crop_marks(c, x, y, width, height, offset=3, length=12):
+    """Draw crop marks outside the corners of the box (x, y, width, height)"""
+    c.setStrokeColor("black")
+    c.setLineWidth(0.5)
+    for corner_x, dx in ((x, -1), (x + width, 1)):
+        for corner_y, dy in ((y, -1), (y + height, 1)):
+            c.line(
+                corner_x + dx * offset,
+                corner_y,
+                corner_x + dx * (offset + length),
+                corner_y,
+            )
+            c.line(
+                corner_x,
+                corner_y + dy * offset,
+                corner_x,
+                corner_y + dy * (offset + length),
+            )
 
 
-def create_menu():
-    """Create a menu PDF organized by dish types with enhanced styling"""
-    # Create PDF with letter size
-    output_path = "menu.pdf"
-    c = canvas.Canvas(output_path, pagesize=letter)
-    width, height = letter
+def draw_imposed_dish_cards(c, dishes, per_sheet=4, fit=False, overflows=None):
+    """Draw the dish cards per_sheet to a page of canvas c, with crop marks
+
+    Cards are drawn straight from the dish records into scaled slots, so
+    every slot reuses the shared card_frame form. fit and overflows work as
+    in draw_combined_dish_cards(). Returns the sheet count.
+    """
+    sheet, slots = imposition_slots(per_sheet)
+    c.setPageSize(sheet)
+    trim_x, trim_y, trim_width, trim_height = card_trim
+    sheets = 0
+    slot = len(slots)
+    for idx, dish in enumerate(dishes):
+        if slot == len(slots):
+            if sheets:
+                c.showPage()
+            sheets += 1
+            slot = 0
+        x, y, scale = slots[slot]
+        slot += 1
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        c.saveState()
+        c.translate(x, y)
+        c.scale(scale, scale)
+        c.translate(-trim_x, -trim_y)
+        clip = c.beginPath()
+        clip.rect(trim_x, trim_y, trim_width, trim_height)
+        c.clipPath(clip, stroke=0)
+        message = overflow_message(dish, draw_dish_card(c, dish, fit))
+        if message and overflows is not None:
+            overflows[idx + 1] = message
+        c.restoreState()
+        draw_crop_marks(c, x, y, trim_width * scale, trim_height * scale)
+        if _metrics is not None:
+            _metrics.cards.append(
+                (idx, time.perf_counter() - wall, time.process_time() - cpu)
+            )
+        print(f"Created dish card {idx + 1}")
+    if sheets:
+        c.showPage()
+    return sheets
+
+
+def create_imposed_dish_cards(
+    dishes, output_path="dish_cards_4up.pdf", per_sheet=4, fit=False, overflows=None
+):
+    """Create the dish cards printed 2, 4 or 6 to a sheet
+
+    output_path may also be a binary file object. Returns the sheet count.
+    """
+    with pdf_canvas(output_path, impositions[per_sheet][0]) as c:
+        sheets = draw_imposed_dish_cards(c, dishes, per_sheet, fit, overflows)
+    return sheets
+
+
+def menu_sections(dishes):
+    """Group dishes into ordered (dish type, dishes) menu sections
+
+    Dishes are grouped in a single pass. Sections follow type_order, then any
+    other types alphabetically, and dishes are sorted by name within each.
+    """
+    groups = {}
+    for dish in dishes:
+        groups.setdefault(dish.dish_type or "Other", []).append(dish)
+
+    rank = {dish_type: i for i, dish_type in enumerate(type_order)}
+    ordered_types = sorted(groups, key=lambda t: (rank.get(t, len(rank)), t))
+    return [
+        (dish_type, sorted(groups[dish_type], key=lambda d: str(d.name)))
+        for dish_type in ordered_types
+    ]
 
-    # Set margins and initial position
+
+def menu_entry_lines(dish_name, provider, table_num, max_width):
+    """Lay out a menu entry as (text, font name) lines
+
+    The dish name is wrapped in Helvetica and followed by one Times-Italic
+    line naming the provider and table. Blank names and providers, which
+    are None after normalize_dishes(), are left out.
+    """
+    lines = [
+        (line, "Helvetica")
+        for line in wrap_text(str(dish_name or ""), "Helvetica", 12, max_width)
+    ]
+    lines.append((provider_line(provider, table_num), "Times-Italic"))
+    return lines
+
+
+def provider_line(provider, table_num):
+    """The "~ by <provider> at Table <n>" line of a menu entry"""
+    by = f" by {provider}" if provider else ""
+    return f"~{by} at Table {table_num}"
+
+
+def layout_menu(dishes, columns=1, title="Dinner Menu"):
+    """Measure and paginate the menu without drawing anything
+
+    The first pass measures every section header and entry, the second packs
+    them into the given number of columns per page. A section header is kept
+    together with its first two entries, and the last entry of a section
+    never starts a column on its own. An entry taller than a column is split
+    and continued in the next column without a bullet. Returns one list of
+    drawing commands per page, to be drawn by draw_menu_page().
+    """
+    width, height = letter
     margin = 72  # 1 inch in points
     content_width = width - 2 * margin
-
-    def draw_page_header(is_first_page=False):
-        # Add the Heritage Fest logo at the top left only on the first page
-        if is_first_page and os.path.exists(logo_path):
-            img = Image.open(logo_path)
-            aspect = img.width / img.height
-            logo_height = 90  # Reduced logo height
+    gutter = 20  # Space between columns
+    column_width = (content_width - (columns - 1) * gutter) / columns
+    indent = 30 if columns == 1 else 10  # Entry indent within a column
+    bullet_width = string_width("◆ ", "Helvetica", 12)
+    available_width = column_width - 2 * indent - bullet_width
+    bottom = margin + 70  # Lowest baseline, clear of the closing line
+
+    # First pass: measure every section into header and entry boxes
+    sections = []
+    for dish_type, type_dishes in menu_sections(dishes):
+        entries = [
+            menu_entry_lines(d.name, d.provider, d.table, available_width)
+            for d in type_dishes
+        ]
+        sections.append((dish_type.title(), entries))
+
+    # Second pass: pack the boxes into columns and pages
+    has_logo = os.path.exists(logo_path)
+    pages = []
+    column = columns - 1
+    y = top = 0
+
+    def new_column():
+        nonlocal column, y, top
+        column += 1
+        if column == columns:
+            column = 0
+            first_page = not pages
+            pages.append([])
+            if first_page and has_logo:
+                logo_height = 90  # Reduced logo height
+                pages[-1].append(("header", logo_height, title))
+                top = height - margin - logo_height - 20
+            else:
+                top = height - margin - 20  # Reduced top margin
+        y = top
+
+    def column_x():
+        return margin + column * (column_width + gutter)
+
+    def section_header(text, with_rule):
+        nonlocal y
+        center = column_x() + column_width / 2
+        pages[-1].append(("section", center, y, text, with_rule, column_width))
+        y -= 25  # Header text plus space before and after its rule
+
+    def entry_height(lines):
+        return 16 * (len(lines) - 1)  # First to last baseline
+
+    new_column()
+    for section_text, entries in sections:
+        # Keep the header with its first entries (orphan control)
+        keep = entries[:2]
+        needed = 25 + sum(entry_height(e) + 15 for e in keep) - 15
+        if needed > top - bottom:
+            # Too tall to keep together: keep the header with the first
+            # entry, or with two of its lines if it is taller than a column
+            needed = 25 + entry_height(entries[0])
+            if needed > top - bottom:
+                needed = 25 + 16
+        if y != top and y - needed < bottom:
+            new_column()
+        section_header(section_text, True)
+
+        for i, lines in enumerate(entries):
+            needed = entry_height(lines)
+            if len(entries) >= 3 and i == len(entries) - 2:
+                # Move the last two entries together (widow control)
+                needed += 15 + entry_height(entries[-1])
+            # Entries taller than a whole column are split where they are
+            fits_column = top - 25 - entry_height(lines) >= bottom
+            if y - needed < bottom and y + 25 != top and fits_column:
+                new_column()
+                section_header(section_text, False)
+            first = True
+            while y - entry_height(lines) < bottom:
+                # Taller than the rest of the column: split it. y is at or
+                # above bottom here, so at least one line fits
+                fit = int((y - bottom) // 16) + 1
+                pages[-1].append(("entry", column_x() + indent, y, lines[:fit], first))
+                lines, first = lines[fit:], False
+                new_column()
+                section_header(section_text, False)
+            pages[-1].append(("entry", column_x() + indent, y, lines, first))
+            y -= entry_height(lines) + 15  # Reduced space between dishes
+
+        y -= 20  # Reduced space between sections
+
+    pages[-1].append(("closing_line", margin + 50))
+    return pages
+
+
+def menu_page_count(dishes, columns=1):
+    """Number of pages the menu needs, from a layout-only pass"""
+    return len(layout_menu(dishes, columns))
+
+
+def draw_menu_page(c, commands):
+    """Draw one page of commands produced by layout_menu()"""
+    width, height = letter
+    margin = 72  # 1 inch in points
+    bullet = "◆ "
+    bullet_width = string_width(bullet, "Helvetica", 12)
+
+    for command in commands:
+        kind = command[0]
+        if kind == "header":
+            # Logo at the top left and centered title, first page only
+            _, logo_height, title = command
+            logo, aspect = get_image(logo_path, logo_height)
             logo_width = logo_height * aspect
-
-            # Position logo on the left
-            logo_x = margin
             logo_y = height - margin - logo_height
+            c.drawImage(logo, margin, logo_y, width=logo_width, height=logo_height)
 
-            # Draw the logo
-            c.drawImage(logo_path, logo_x, logo_y, width=logo_width, height=logo_height)
+            # Menu QR code at the top right, so a printed menu links to the
+            # online one
+            qr_size = 60
+            draw_menu_qr(
+                c, width - margin - qr_size, height - margin - qr_size, qr_size
+            )
 
-            # Draw centered title
-            title = "Dinner Menu"
             c.setFont("Helvetica-Bold", 24)  # Reduced title size
             c.setFillColor(NAVY_BLUE)
-            title_width = c.stringWidth(title, "Helvetica-Bold", 24)
-            # Center the title on the page
-            title_x = (width - title_width) / 2
+            title_width = string_width(title, "Helvetica-Bold", 24)
             title_y = height - margin - (logo_height / 2) + 10
-            c.drawString(title_x, title_y, title)
-
-            return height - margin - logo_height - 20  # Reduced spacing after header
-        return height - margin - 20  # Reduced top margin for subsequent pages
+            c.drawString((width - title_width) / 2, title_y, title)
 
-    def draw_decorative_line(y_position):
-        # Draw decorative line
-        c.setStrokeColor(ORANGE)
-        c.setLineWidth(2)
-        c.line(margin + 30, y_position, width - margin - 30, y_position)
-
-    # Start with the header
-    current_y = draw_page_header(True)
+        elif kind == "section":
+            _, center, y, text, with_rule, column_width = command
+            c.setFillColor(NAVY_BLUE)
+            c.setFont("Helvetica-Bold", 14)  # Reduced section header size
+            text_width = string_width(text, "Helvetica-Bold", 14)
+            c.drawString(center - text_width / 2, y, text)
+
+            if with_rule:
+                # Draw short decorative line under section header
+                c.setStrokeColor(ORANGE)
+                c.setLineWidth(1)
+                line_width = min(text_width + 40, 200, column_width)
+                c.line(center - line_width / 2, y - 10, center + line_width / 2, y - 10)
+
+        elif kind == "entry":
+            _, x, y, lines, first = command
+            c.setFillColor(NAVY_BLUE)
+            c.setFont("Helvetica", 12)
+            if first:  # Continued entries have no bullet
+                c.drawString(x, y, bullet)
+            for line, font_name in lines:
+                c.setFont(font_name, 12)
+                c.drawString(x + bullet_width, y, line)
+                y -= 16  # Reduced line spacing to match smaller font
+
+        elif kind == "closing_line":
+            c.setStrokeColor(ORANGE)
+            c.setLineWidth(2)
+            c.line(margin + 30, command[1], width - margin - 30, command[1])
+
+
+def create_menu(dishes, output_path="menu.pdf", columns=1, title="Dinner Menu"):
+    """Create a menu PDF organized by dish types with enhanced styling
+
+    output_path may also be a binary file object. Returns the number of
+    pages written.
+    """
+    with pdf_canvas(output_path) as c:
+        page_count = draw_menu(c, dishes, columns, title)
+    return page_count
+
+
+def draw_menu(c, dishes, columns=1, title="Dinner Menu"):
+    """Draw the whole menu onto canvas c and return its page count"""
+    pages = layout_menu(dishes, columns, title)
+    for commands in pages:
+        draw_menu_page(c, commands)
+        c.showPage()
+    return len(pages)
+
+
+def menu_data(dishes):
+    """The menu as plain data: ordered sections of dishes with their tables"""
+    return {
+        "title": "Dinner Menu",
+        "sections": [
+            {
+                "type": dish_type,
+                "dishes": [
+                    {"name": dish.name, "provider": dish.provider, "table": dish.table}
+                    for dish in section
+                ],
+            }
+            for dish_type, section in menu_sections(dishes)
+        ],
+    }
 
-    # # Draw decorative line
-    # draw_decorative_line(current_y)
-    # current_y -= 30  # Reduced space after decorative line
 
-    # Group dishes by type
-    dish_types = df["Type of the dish:"].unique()
+def menu_json(data):
+    """Compact UTF-8 JSON feed of menu_data()"""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
-    # Define the desired order
-    type_order = ["Appetizer", "Salad", "Main course", "Dessert", "Drink"]
 
-    # Filter and sort dish types according to the defined order
-    ordered_types = []
-    for dish_type in type_order:
-        if dish_type in dish_types:
-            ordered_types.append(dish_type)
+def menu_html(data):
+    """Self-contained static HTML page of menu_data() for phones
 
-    # Add any remaining types that weren't in our predefined order
-    for dish_type in sorted(dish_types):
-        if dish_type not in ordered_types:
-            ordered_types.append(dish_type)
+    No images, scripts or external styles, so the page is a single small
+    request even on a congested venue network.
+    """
+    from html import escape
 
-    def draw_dish_entry(
-        dish_name, provider, dish_type, needs_outlet, x, y, available_width
-    ):
-        """Helper function to draw dish name and provider with proper wrapping"""
-        bullet = "◆ "
-        c.setFont("Helvetica", 12)  # Reduced font size for dish items
-        bullet_width = c.stringWidth(bullet, "Helvetica", 12)
-
-        # Get table number
-        table_num = get_table_number(dish_type, needs_outlet)
-
-        # Format provider text with table number
-        provider_text = f" ~ by {provider} at Table {table_num}"
-
-        # Combine dish name and provider
-        full_text = f"{dish_name}{provider_text}"
-
-        # Calculate wrapping
-        words = full_text.split()
-        lines = []
-        current_line = []
-        current_width = bullet_width
-
-        for word in words:
-            # Check if this is the provider part
-            if word == "~" and "by" in words[words.index(word) + 1 :]:
-                # Add provider part in Times-Italic font
-                provider_part = " ".join(words[words.index(word) :])
-                if current_line:
-                    lines.append(
-                        (" ".join(current_line), "Helvetica")
-                    )  # Regular font for dish name
-                lines.append((provider_part, "Times-Italic"))  # Italic for provider
-                break
-
-            # Calculate word width in regular font (for dish name)
-            word_width = c.stringWidth(word + " ", "Helvetica", 12)  # Reduced font size
-
-            if current_width + word_width <= available_width:
-                current_line.append(word)
-                current_width += word_width
-            else:
-                if current_line:
-                    lines.append((" ".join(current_line), "Helvetica"))
-                current_line = [word]
-                current_width = bullet_width + word_width
-
-        if current_line and not any("by" in line[0] for line in lines):
-            lines.append((" ".join(current_line), "Helvetica"))
-
-        # Draw lines
-        current_y = y
-        for i, (line, font_name) in enumerate(lines):
-            if i == 0:
-                # First line includes bullet
-                c.setFont("Helvetica", 12)  # Reduced font size
-                c.drawString(x, current_y, bullet)
-                x_offset = x + bullet_width
-            else:
-                # Subsequent lines are indented
-                x_offset = x + bullet_width
-
-            # Set appropriate font with reduced size
-            c.setFont(font_name, 12)  # Reduced font size
-            c.drawString(x_offset, current_y, line)
-            current_y -= 16  # Reduced line spacing to match smaller font
-
-        return current_y + 16  # Return the last y position with reduced spacing
-
-    for dish_type in ordered_types:
-        # Skip if we're running out of space
-        if current_y < margin + 80:  # Reduced minimum space requirement
-            c.showPage()
-            current_y = draw_page_header(False)
-
-        # Draw section header with decorative elements
-        c.setFillColor(NAVY_BLUE)
-        c.setFont("Helvetica-Bold", 14)  # Reduced section header size
-        section_text = dish_type.title()
-        text_width = c.stringWidth(section_text, "Helvetica-Bold", 14)
-
-        # Draw centered section header
-        c.drawString((width - text_width) / 2, current_y, section_text)
-        current_y -= 10  # Reduced space before line
-
-        # Draw short decorative line under section header
-        c.setStrokeColor(ORANGE)
-        line_width = min(text_width + 40, 200)
-        c.line((width - line_width) / 2, current_y, (width + line_width) / 2, current_y)
-        current_y -= 15  # Reduced space after line
-
-        # Get dishes of this type
-        type_dishes = df[df["Type of the dish:"] == dish_type]
-        # Sort dishes alphabetically
-        type_dishes = type_dishes.sort_values(by=dish_column)
-
-        for _, row in type_dishes.iterrows():
-            # Check if we need a new page
-            if current_y < margin + 80:  # Reduced minimum space requirement
-                c.showPage()
-                current_y = draw_page_header(False)
-
-                # Redraw section header on new page
-                c.setFillColor(NAVY_BLUE)
-                c.setFont("Helvetica-Bold", 14)
-                c.drawString((width - text_width) / 2, current_y, section_text)
-                current_y -= 25
-
-            # Draw dish name and provider with table number
-            dish_name = str(row[dish_column]).strip()
-            provider = str(row[provider_column]).strip()
-            dish_type = str(row["Type of the dish:"]).strip()
-            needs_outlet = str(row[outlet_column]).strip()
-
-            # Calculate available width for the entire entry
-            available_width = content_width - 60
-
-            # Draw the dish entry and update current_y
-            current_y = draw_dish_entry(
-                dish_name,
-                provider,
-                dish_type,
-                needs_outlet,
-                margin + 30,
-                current_y,
-                available_width,
-            )
-            current_y -= 15  # Reduced space between dishes
+    parts = [
+        "<!doctype html><html lang=en><meta charset=utf-8>"
+        '<meta name=viewport content="width=device-width,initial-scale=1">'
+        f"<title>{escape(data['title'])}</title><style>"
+        "body{font:17px/1.4 Helvetica,Arial,sans-serif;color:#001f5c;"
+        "max-width:36em;margin:auto;padding:0 1em}h1{text-align:center}"
+        "h2{border-bottom:2px solid #ff8000;font-size:1.1em}"
+        "ul{list-style:none;padding:0}li{margin:.6em 0}"
+        "i{display:block;font-family:Times,serif;color:#444}"
+        f"</style><h1>{escape(data['title'])}</h1>"
+    ]
+    for section in data["sections"]:
+        parts.append(f"<h2>{escape(section['type'])}</h2><ul>")
+        for dish in section["dishes"]:
+            line = provider_line(dish["provider"], dish["table"])
+            parts.append(f"<li>{escape(dish['name'] or '')}<i>{escape(line)}</i>")
+        parts.append("</ul>")
+    return "".join(parts).encode("utf-8")
 
-        current_y -= 20  # Reduced space between sections
 
-    # Draw final decorative line at the bottom of the last page
-    draw_decorative_line(margin + 50)
+def create_empty_dish_card(output_path="dish_card.pdf"):
+    """Create an empty dish card template with a white box for the title
 
-    # Save the menu
-    c.save()
+    output_path may also be a binary file object.
+    """
+    with pdf_canvas(output_path) as c:
+        draw_empty_dish_card(c)
+    if isinstance(output_path, (str, os.PathLike)):
+        print(f"Created empty dish card template: {output_path}")
 
 
-def create_empty_dish_card():
-    """Create an empty dish card template with a white box for the title"""
-    output_path = "dish_card.pdf"
-    c = canvas.Canvas(output_path, pagesize=letter)
+def draw_empty_dish_card(c):
+    """Draw the empty dish card template onto the current page of canvas c"""
     width, height = letter
 
     # Set margins and initial position
@@ -511,11 +1895,8 @@ def create_empty_dish_card():
     content_width = width - 2 * margin
     header_height = 100  # Increased header height for longer titles
 
-    # Draw colored header background
-    c.setFillColor(NAVY_BLUE)
-    c.rect(
-        margin, height - margin - header_height, content_width, header_height, fill=1
-    )
+    # Header band, border and logo come from the shared template
+    draw_template(c, "card_frame")
 
     # Draw white box for handwritten title
     c.setFillColor("white")
@@ -529,11 +1910,6 @@ def create_empty_dish_card():
         fill=1,
     )
 
-    # Draw border with orange color
-    c.setStrokeColor(ORANGE)
-    c.setLineWidth(3)
-    c.rect(margin, margin, content_width, height - 2 * margin)
-
     # Start position for content
     current_y = height - margin - header_height - 60
 
@@ -568,114 +1944,1225 @@ def create_empty_dish_card():
         # Move down for next section
         current_y -= 50  # Increased spacing between sections
 
-    # Add the Heritage Fest logo at the bottom
-    if os.path.exists(logo_path):
-        img = Image.open(logo_path)
-        aspect = img.width / img.height
-        logo_height = 100
-        logo_width = logo_height * aspect
 
-        # Calculate centered position for logo
-        logo_x = (width - logo_width) / 2
-        logo_y = margin + 10
+def sign_file_name(sign_text):
+    """File name of the sign showing sign_text, e.g. table_1_sign.pdf"""
+    return f"{sign_text.lower().replace(' ', '_')}_sign.pdf"
 
-        # Draw the logo
-        c.drawImage(logo_path, logo_x, logo_y, width=logo_width, height=logo_height)
 
-    # Save the page
-    c.save()
+def create_signs(output_dir=".", tables=default_tables):
+    """Create large signs for tables and directions in landscape orientation"""
+    write_signs(DirectoryWriter(output_dir), sign_specs(tables))
+
+
+def sign_specs(tables=default_tables, dishes=None):
+    """Return (text, subtitle) of every sign
+
+    There is one sign per table of the plan, then the direction_signs. With
+    dishes, each table sign is subtitled with the dish types seated there.
+    """
+    seated = {}
+    for dish in dishes or ():
+        seated.setdefault(dish.table, []).append(dish)
+    specs = []
+    for table in tables:
+        sections = menu_sections(seated.get(table.number, []))
+        subtitle = " · ".join(dish_type for dish_type, _ in sections) or None
+        specs.append((f"TABLE {table.number}", subtitle))
+    return specs + [(text, None) for text in direction_signs]
+
+
+def _render_sign(spec):
+    """Worker entry point: render one sign to PDF bytes"""
+    return pdf_bytes(lambda c: draw_sign(c, *spec), landscape)
+
+
+def write_signs(writer, specs, single_file=False, workers=1):
+    """Render the signs described by specs and hand them to writer
+
+    With single_file every sign is a page of one signs.pdf, which holds the
+    logo and QR code once; otherwise each sign is its own file, rendered on
+    a pool of worker processes if workers > 1. Returns the file names.
+    """
+    if single_file:
+        writer.write("signs.pdf", pdf_bytes(lambda c: draw_signs(c, specs), landscape))
+        print(f"Created signs.pdf ({len(specs)} signs)")
+        return ["signs.pdf"]
+
+    if workers > 1 and len(specs) > 1:
+        from itertools import chain, repeat
+
+        # The first sign is rendered here, which decodes the logo and QR code
+        # once. Under the fork start method the workers inherit that image
+        # cache; otherwise each worker decodes the images once for itself
+        first = _render_sign(specs[0])
+        pool = worker_pool(workers)
+        counted = pool.map(_counted, repeat(_render_sign), specs[1:], chunksize=4)
+        rendered = chain([first], _merged(counted))
+    else:
+        pool = None
+        rendered = map(_render_sign, specs)
+
+    names = []
+    try:
+        for (sign_text, _), data in zip(specs, rendered):
+            file_name = sign_file_name(sign_text)
+            writer.write(file_name, data)
+            names.append(file_name)
+            print(f"Created sign: {file_name}")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return names
+
+
+def _merged(counted):
+    """Yield the results of _counted() calls, merging their counts"""
+    for result, counts in counted:
+        merge_counts(counts)
+        yield result
+
+
+def draw_signs(c, specs):
+    """Draw every (text, subtitle) sign as its own page of canvas c"""
+    for spec in specs:
+        draw_sign(c, *spec)
+        c.showPage()
+
+
+def fit_font_size(text, font_name, max_width, max_height, max_size):
+    """Largest size up to max_size at which text fits max_width x max_height
+
+    The height is the font's ascent to descent. Both it and the text width
+    scale linearly with the size, so the size is solved directly from the
+    metrics at one point.
+    """
+    from reportlab.pdfbase.pdfmetrics import getAscentDescent
+
+    ascent, descent = getAscentDescent(font_name, 1)
+    size = min(max_size, max_height / (ascent - descent))
+    text_width = string_width(text, font_name, 1)
+    if text_width:
+        size = min(size, max_width / text_width)
+    return size
+
+
+def draw_sign(c, sign_text, subtitle=None):
+    """Draw one landscape sign onto the current page of canvas c"""
+    from reportlab.pdfbase.pdfmetrics import getAscentDescent
+
+    width, height = landscape
+    margin = 72  # 1 inch in points
+    border_margin = 40  # Space between text and border
+
+    # Logo and QR code come from the shared template
+    draw_template(c, "sign_header")
+
+    # Largest font up to 120 that fits between the margins, so long table
+    # numbers shrink instead of running off the page
+    font_name = "Helvetica-Bold"
+    font_size = fit_font_size(
+        sign_text, font_name, width - 2 * (margin + border_margin), 200, 120
+    )
+    ascent, descent = getAscentDescent(font_name, font_size)
+    text_width = string_width(sign_text, font_name, font_size)
+
+    # Center the text, from ascent to descent, on the page
+    x = (width - text_width) / 2
+    y = (height - ascent - descent) / 2
+
+    # Draw orange border
+    c.setStrokeColor(ORANGE)
+    c.setLineWidth(3)
+    c.rect(
+        x - border_margin,
+        y + descent - border_margin,
+        text_width + 2 * border_margin,
+        ascent - descent + 2 * border_margin,
+    )
+
+    # Draw the text
+    c.setFillColor(NAVY_BLUE)
+    draw_text(c, sign_text, x, y, font_name, font_size)
+
+    # Dish types seated at the table, under the border
+    if subtitle:
+        subtitle_size = fit_font_size(subtitle, "Helvetica", width - 2 * margin, 60, 36)
+        subtitle_ascent = getAscentDescent("Helvetica", subtitle_size)[0]
+        c.setFont("Helvetica", subtitle_size)
+        c.drawCentredString(
+            width / 2, y + descent - border_margin - 20 - subtitle_ascent, subtitle
+        )
+
+
+def pdf_bytes(draw, pagesize=letter):
+    """Render draw(canvas) into an in-memory PDF and return its bytes"""
+    from io import BytesIO
+
+    buffer = BytesIO()
+    with pdf_canvas(buffer, pagesize) as c:
+        draw(c)
+    return buffer.getvalue()
+
+
+def card_file_name(idx, output_dir=output_dir):
+    """Output name of the card for row idx, e.g. dish_cards/dish_card_1.pdf"""
+    return f"{output_dir}/dish_card_{idx+1}.pdf"
+
+
+def _render_timed(idx, dish, fit=False):
+    """Render one card
+
+    Returns (idx, wall seconds, CPU seconds, PDF bytes, overflow message).
+    """
+    wall, cpu = time.perf_counter(), time.process_time()
+    overflow = []
+
+    def draw(c):
+        overflow.extend(draw_dish_card(c, dish, fit))
+
+    data = pdf_bytes(draw)
+    return (
+        idx,
+        time.perf_counter() - wall,
+        time.process_time() - cpu,
+        data,
+        overflow_message(dish, overflow),
+    )
+
+
+def _render_batch(batch):
+    """Worker entry point: render a list of (idx, dish, fit) tuples"""
+    return [_render_timed(*args) for args in batch]
+
+
+def create_dish_cards(
+    rows,
+    output_dir=output_dir,
+    workers=1,
+    batch_size=16,
+    writer=None,
+    fit=False,
+    overflows=None,
+):
+    """Create dish cards from (idx, dish) pairs, optionally in a process pool
+
+    Cards are rendered to bytes and handed to writer, a DirectoryWriter for
+    the current directory by default. fit and overflows work as in
+    draw_combined_dish_cards().
+    """
+    writer = writer or DirectoryWriter()
+    payloads = ((idx, dish, fit) for idx, dish in rows)
+
+    def card_done(result):
+        idx, wall, cpu, data, message = result
+        writer.write(card_file_name(idx, output_dir), data)
+        if message and overflows is not None:
+            overflows[idx + 1] = message
+        if _metrics is not None:
+            _metrics.cards.append((idx, wall, cpu))
+        print(f"Created dish card {idx + 1}")
+
+    if workers <= 1:
+        for args in payloads:
+            card_done(_render_timed(*args))
+        return
+
+    from collections import deque
+    from itertools import islice
+
+    # Rows go out in small batches with only a couple of batches per worker in
+    # flight, so memory stays flat however long the CSV is. Batches are
+    # collected in submission order, which keeps progress deterministic.
+    pending = deque()
+
+    def report(future):
+        results, counts = future.result()
+        merge_counts(counts)
+        for result in results:
+            card_done(result)
+
+    with worker_pool(workers) as pool:
+        for batch in iter(lambda: list(islice(payloads, batch_size)), []):
+            pending.append(pool.submit(_counted, _render_batch, batch))
+            if len(pending) >= 2 * workers:
+                report(pending.popleft())
+        while pending:
+            report(pending.popleft())
+
+
+def file_hash(path):
+    """Return the SHA-256 of a file's contents, or None if it does not exist"""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def content_hash(*parts):
+    """Return a stable SHA-256 over JSON-serialisable parts"""
+    data = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def load_manifest(path=manifest_path):
+    """Load the build manifest, or an empty one if there is none yet"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest, path=manifest_path):
+    """Write the build manifest, replacing the old one atomically"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def up_to_date(manifest, key, digest, writer, *names):
+    """Return True if every output in names was built from inputs hashing to
+    digest and still exists"""
+    return (
+        manifest is not None
+        and manifest.get(key) == digest
+        and all(writer.exists(name) for name in names)
+    )
+
+
+def card_hash(dish, logo_hash, fit=False):
+    """Content hash of everything a dish card is drawn from"""
+    qr = menu_url if card_qr else None
+    return content_hash(TEMPLATE_VERSION, logo_hash, qr, fit, astuple(dish))
+
+
+def menu_hash(dishes, columns, logo_hash, title="Dinner Menu"):
+    """Content hash of everything the menu is drawn from"""
+    return content_hash(
+        TEMPLATE_VERSION,
+        logo_hash,
+        menu_url,
+        columns,
+        title,
+        [(d.name, d.provider, d.dish_type, d.table) for d in dishes],
+    )
+
+
+def signs_hash(logo_hash, qr_hash, specs, single_file=False):
+    """Content hash of everything the signs and empty template are drawn from
+
+    The empty template uses the card frame, which shows the QR code when
+    card_qr is set.
+    """
+    return content_hash(
+        TEMPLATE_VERSION, logo_hash, qr_hash, card_qr, specs, single_file
+    )
+
+
+def render_cards(
+    dishes,
+    output_dir=output_dir,
+    workers=1,
+    combined=False,
+    manifest=None,
+    writer=None,
+    per_sheet=1,
+    fit=False,
+):
+    """Render the dish cards, one file per dish or a single combined PDF
+
+    per_sheet of 2, 4 or 6 renders a single dish_cards_<n>up.pdf instead,
+    with that many cards imposed on each sheet. With fit, font sizes are
+    shrunk until every field fits. Cards that still overflow are reported.
+
+    Outputs go to writer, a DirectoryWriter for the current directory by
+    default. When a manifest dict is given, only cards whose row, template
+    version or logo changed since the recorded build are re-rendered, cards
+    of rows that no longer exist are deleted, and the manifest is updated in
+    place.
+    """
+    from io import BytesIO
+
+    writer = writer or DirectoryWriter()
+    logo_hash = file_hash(logo_path)
+    overflows = {}
+
+    if per_sheet > 1:
+        name = f"dish_cards_{per_sheet}up.pdf"
+        digest = content_hash(
+            per_sheet, [card_hash(dish, logo_hash, fit) for dish in dishes]
+        )
+        if up_to_date(manifest, "imposed", digest, writer, name):
+            print(f"{name} is up to date")
+            return
+        buffer = BytesIO()
+        sheets = create_imposed_dish_cards(dishes, buffer, per_sheet, fit, overflows)
+        writer.write(name, buffer.getvalue())
+        print(f"Created {name} ({sheets} sheets)")
+        report_overflow(overflows)
+        if manifest is not None:
+            manifest["imposed"] = digest
+        return
+
+    if combined:
+        name = "dish_cards.pdf"
+        digest = content_hash([card_hash(dish, logo_hash, fit) for dish in dishes])
+        if up_to_date(manifest, "combined", digest, writer, name):
+            print(f"{name} is up to date")
+            return
+        buffer = BytesIO()
+        create_combined_dish_cards(dishes, buffer, fit, overflows)
+        writer.write(name, buffer.getvalue())
+        print(f"Created combined dish cards: {name}")
+        report_overflow(overflows)
+        if manifest is not None:
+            manifest["combined"] = digest
+        return
+
+    previous = (manifest or {}).get("cards", {})
+    card_hashes = {}
+    rendered = []
+
+    def changed_rows():
+        # Hashes are recorded while the rows are handed to the renderer
+        for idx, dish in enumerate(dishes):
+            name = f"dish_card_{idx+1}.pdf"
+            card_hashes[name] = card_hash(dish, logo_hash, fit)
+            if (
+                manifest is None
+                or previous.get(name) != card_hashes[name]
+                or not writer.exists(f"{output_dir}/{name}")
+            ):
+                rendered.append(idx)
+                yield idx, dish
+
+    create_dish_cards(
+        changed_rows(),
+        output_dir,
+        workers=workers,
+        writer=writer,
+        fit=fit,
+        overflows=overflows,
+    )
+    if manifest is None:
+        report_overflow(overflows)
+        return
+
+    # Cards that were not re-rendered keep their overflow from earlier builds
+    rendered = set(rendered)
+    for number, message in manifest.get("card_overflow", {}).items():
+        idx = int(number) - 1
+        if idx not in rendered and idx < len(card_hashes):
+            overflows[idx + 1] = message
+    manifest["card_overflow"] = {str(number): m for number, m in overflows.items()}
+    report_overflow(overflows)
+
+    # Remove cards of rows that were deleted from the CSV
+    for name in set(previous) - set(card_hashes):
+        stale = f"{output_dir}/{name}"
+        if writer.exists(stale):
+            writer.remove(stale)
+            print(f"Removed {stale}")
+    print(f"{len(card_hashes) - len(rendered)} dish cards up to date")
+    manifest["cards"] = card_hashes
+
+
+def render_menu(
+    dishes,
+    output_path="menu.pdf",
+    columns=1,
+    manifest=None,
+    writer=None,
+    title="Dinner Menu",
+    manifest_key="menu",
+):
+    """Render the dinner menu, skipping it if its inputs are unchanged"""
+    from io import BytesIO
+
+    writer = writer or DirectoryWriter()
+    digest = menu_hash(dishes, columns, file_hash(logo_path), title)
+    if up_to_date(manifest, manifest_key, digest, writer, output_path):
+        print(f"{output_path} is up to date")
+        return
+    buffer = BytesIO()
+    page_count = create_menu(dishes, buffer, columns, title)
+    writer.write(output_path, buffer.getvalue())
+    print(f"Created {output_path} ({page_count} pages)")
+    if manifest is not None:
+        manifest[manifest_key] = digest
+
+
+def render_menu_variants(dishes, filters, columns=1, manifest=None, writer=None):
+    """Render a filtered menu_<name>.pdf for every filter of menu_variants()
+
+    The dishes are split by the dietary index built when they were loaded,
+    so no answer is parsed again. The menu of a filter no dish passes is
+    removed.
+    """
+    writer = writer or DirectoryWriter()
+    variants = menu_variants(dishes, dishes.diet_index(), filters)
+    for name, variant in variants.items():
+        output_path = f"menu_{name}.pdf"
+        if not variant:
+            print(f"No dishes for {output_path}")
+            # Do not leave a menu listing dishes that no longer qualify
+            if manifest is not None:
+                manifest.pop(f"menu_{name}", None)
+            if writer.exists(output_path):
+                writer.remove(output_path)
+                print(f"Removed {output_path}")
+            continue
+        render_menu(
+            variant,
+            output_path,
+            columns,
+            manifest,
+            writer,
+            title=f"Dinner Menu: {name.replace('-', ' ').title()}",
+            manifest_key=f"menu_{name}",
+        )
+
+
+def render_menu_web(dishes, basename="menu", manifest=None, writer=None):
+    """Export the menu as <basename>.html and <basename>.json for the QR code
+
+    Both files are also written gzip-precompressed (.gz) for static servers
+    that can send them as they are. They are skipped if the menu is unchanged.
+    """
+    import gzip
+
+    writer = writer or DirectoryWriter()
+    data = menu_data(dishes)
+    digest = content_hash(TEMPLATE_VERSION, data)
+    names = [f"{basename}.{ext}" for ext in ("html", "html.gz", "json", "json.gz")]
+    if up_to_date(manifest, "menu_web", digest, writer, *names):
+        print(f"{basename}.html and {basename}.json are up to date")
+        return
+
+    sizes = []
+    for name, body in (
+        (f"{basename}.html", menu_html(data)),
+        (f"{basename}.json", menu_json(data)),
+    ):
+        # mtime=0 keeps the compressed files identical for identical menus
+        compressed = gzip.compress(body, compresslevel=9, mtime=0)
+        writer.write(name, body)
+        writer.write(f"{name}.gz", compressed)
+        sizes.append(f"{name} ({len(compressed)} bytes gzipped)")
+    print(f"Created {' and '.join(sizes)}")
+    if manifest is not None:
+        manifest["menu_web"] = digest
+
+
+def render_signs(
+    output_dir=".",
+    manifest=None,
+    writer=None,
+    tables=default_tables,
+    dishes=None,
+    single_file=False,
+    workers=1,
+):
+    """Render the empty dish card template and a sign per table and direction
+
+    With dishes, table signs are subtitled with the dish types seated there.
+    single_file and workers are passed on to write_signs(). Sign files that
+    the table plan no longer needs are removed.
+    """
+    writer = writer or DirectoryWriter(output_dir)
+    specs = sign_specs(tables, dishes)
+    digest = signs_hash(file_hash(logo_path), qr_source(), specs, single_file)
+    sign_files = (manifest or {}).get("sign_files", [])
+    if up_to_date(manifest, "signs", digest, writer, "dish_card.pdf", *sign_files):
+        print("Signs are up to date")
+        return
+    writer.write("dish_card.pdf", pdf_bytes(draw_empty_dish_card))
     print("Created empty dish card template: dish_card.pdf")
+    names = write_signs(writer, specs, single_file, workers)
+    if manifest is None:
+        return
+
+    for name in sorted(set(manifest.get("sign_files", [])) - set(names)):
+        if writer.exists(name):
+            writer.remove(name)
+            print(f"Removed {name}")
+    manifest["signs"] = digest
+    manifest["sign_files"] = names
+
+
+class PreviewCache:
+    """Dishes and rendered PDFs for the preview server
+
+    PDFs are kept in an LRU cache keyed by the content hash of their inputs,
+    which doubles as the ETag. The CSV and images are re-checked on every
+    request; when they change the dishes are reloaded, and only outputs
+    whose inputs actually changed are rendered again.
+    """
+
+    def __init__(
+        self,
+        csv_path,
+        menu_columns=1,
+        max_entries=256,
+        tables=None,
+        sign_subtitles=False,
+        fit=False,
+    ):
+        import threading
+        from collections import OrderedDict
+
+        self.csv_path = csv_path
+        self.menu_columns = menu_columns
+        self.tables = tables or default_tables
+        self.sign_subtitles = sign_subtitles
+        self.fit = fit
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.pdfs = OrderedDict()
+        self.stamps = None
+
+    def _stamps(self):
+        stamps = []
+        for path in (self.csv_path, logo_path, qr_code_path):
+            try:
+                stat = os.stat(path)
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamps.append(None)
+        return stamps
+
+    def state(self):
+        """Return (dishes, logo hash, QR hash), reloading changed inputs"""
+        with self.lock:
+            stamps = self._stamps()
+            if stamps != self.stamps:
+                self.dishes = list(DishCSV(self.csv_path, self.tables))
+                self.logo_hash = file_hash(logo_path)
+                self.qr_hash = qr_source()
+                self.stamps = stamps
+            return self.dishes, self.logo_hash, self.qr_hash
+
+    def get(self, key, render):
+        """Return the PDF cached under key, rendering it on a miss"""
+        with self.lock:
+            if key in self.pdfs:
+                self.pdfs.move_to_end(key)
+                return self.pdfs[key]
+        # Render outside the lock so requests for other PDFs are not blocked
+        data = render()
+        with self.lock:
+            self.pdfs[key] = data
+            while len(self.pdfs) > self.max_entries:
+                self.pdfs.popitem(last=False)
+        return data
+
+    def lookup(self, path):
+        """Return (etag, render) for a URL path, or None if there is no PDF"""
+        dishes, logo_hash, qr_hash = self.state()
+        match = re.fullmatch(r"/card/(\d+)\.pdf", path)
+        if match and 1 <= int(match.group(1)) <= len(dishes):
+            dish = dishes[int(match.group(1)) - 1]
+            fit = self.fit
+            return card_hash(dish, logo_hash, fit), lambda: pdf_bytes(
+                lambda c: draw_dish_card(c, dish, fit)
+            )
+        if path == "/menu.pdf":
+            columns = self.menu_columns
+            return menu_hash(dishes, columns, logo_hash), lambda: pdf_bytes(
+                lambda c: draw_menu(c, dishes, columns)
+            )
+        specs = sign_specs(self.tables, dishes if self.sign_subtitles else None)
+        digest = signs_hash(logo_hash, qr_hash, specs)
+        # Every route needs its own key, since they share the cache
+        if path == "/dish_card.pdf":
+            return content_hash(digest, "dish_card.pdf"), lambda: pdf_bytes(
+                draw_empty_dish_card
+            )
+        if path == "/signs.pdf":
+            return content_hash(digest, "signs.pdf"), lambda: pdf_bytes(
+                lambda c: draw_signs(c, specs), landscape
+            )
+        for spec in specs:
+            if path == "/signs/" + sign_file_name(spec[0]).replace("_sign", ""):
+                return content_hash(digest, spec), lambda: _render_sign(spec)
+        return None
+
+    def index(self):
+        """HTML page linking every PDF the server can render"""
+        dishes = self.state()[0]
+        links = [
+            ("/menu.pdf", "Menu"),
+            ("/dish_card.pdf", "Empty dish card"),
+            ("/signs.pdf", "All signs"),
+        ]
+        for sign_text, _ in sign_specs(self.tables):
+            name = sign_file_name(sign_text).replace("_sign", "")
+            links.append((f"/signs/{name}", f"Sign: {sign_text}"))
+        for idx, dish in enumerate(dishes):
+            links.append((f"/card/{idx + 1}.pdf", f"Card {idx + 1}: {dish.name}"))
+
+        from html import escape
+
+        items = "".join(
+            f'<li><a href="{url}">{escape(str(label))}</a></li>' for url, label in links
+        )
+        return (
+            "<!doctype html><meta charset=utf-8><title>Heritage Fest previews</title>"
+            f"<h1>Heritage Fest previews</h1><ul>{items}</ul>"
+        ).encode("utf-8")
+
+
+def serve(args):
+    """Serve on-demand PDF previews over HTTP until interrupted"""
+    from concurrent.futures import ThreadPoolExecutor
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    cache = PreviewCache(
+        args.csv,
+        args.menu_columns,
+        tables=args.table_plan,
+        sign_subtitles=args.sign_subtitles,
+        fit=args.fit,
+    )
 
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            try:
+                response = self._respond(path)
+            except (OSError, ValueError, csv.Error) as exc:
+                # An unreadable or half-saved CSV on any route
+                response = (500, "text/plain; charset=utf-8", str(exc).encode())
+            self._send(*response)
+
+        def _respond(self, path):
+            """Return (status, content type, body[, ETag]) for path"""
+            if path == "/":
+                return 200, "text/html; charset=utf-8", cache.index()
+            found = cache.lookup(path)
+            if found is None:
+                return 404, "text/plain; charset=utf-8", b"Not found"
+
+            key, render = found
+            etag = f'"{key}"'
+            if etag in self.headers.get("If-None-Match", ""):
+                return 304, None, b"", etag
+            return 200, "application/pdf", cache.get(key, render), etag
+
+        def _send(self, status, content_type, body, etag=None):
+            self.send_response(status)
+            if content_type:
+                self.send_header("Content-Type", content_type)
+            if etag:
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    class PooledHTTPServer(HTTPServer):
+        """HTTPServer that handles requests on a fixed pool of threads"""
+
+        pool = ThreadPoolExecutor(max_workers=args.threads)
+
+        def process_request(self, request, client_address):
+            self.pool.submit(self._process, request, client_address)
+
+        def _process(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    server = PooledHTTPServer((args.host, args.port), Handler)
+    print(f"Serving previews on http://{args.host}:{args.port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopped serving")
+    finally:
+        server.server_close()
+        PooledHTTPServer.pool.shutdown(wait=False)
+    return 0
 
-def create_signs():
-    """Create large signs for tables and directions in landscape orientation"""
-    signs = ["TABLE 1", "TABLE 2", "TABLE 3", "ENTER", "EXIT"]
-
-    for sign_text in signs:
-        # Create PDF with letter size in landscape
-        output_path = f"{sign_text.lower().replace(' ', '_')}_sign.pdf"
-        width, height = letter[1], letter[0]  # Swap width and height for landscape
-        c = canvas.Canvas(output_path, pagesize=(width, height))
-
-        # Set margins
-        margin = 72  # 1 inch in points
-        content_width = width - 2 * margin
-        content_height = height - 2 * margin
-
-        # Draw Heritage Fest logo on the left top
-        if os.path.exists(logo_path):
-            img = Image.open(logo_path)
-            aspect = img.width / img.height
-            logo_height = 120
-            logo_width = logo_height * aspect
 
-            # Position logo in the top left
-            logo_x = margin
-            logo_y = height - margin - logo_height
-            c.drawImage(logo_path, logo_x, logo_y, width=logo_width, height=logo_height)
-
-        # Draw QR code on the right top if it exists
-        qr_code_path = "menu_qr.png"
-        if os.path.exists(qr_code_path):
-            qr_img = Image.open(qr_code_path)
-            qr_aspect = qr_img.width / qr_img.height
-            qr_height = 100
-            qr_width = qr_height * qr_aspect
-
-            # Position QR code in the top right
-            qr_x = width - margin - qr_width
-            qr_y = height - margin - qr_height
-            c.drawImage(qr_code_path, qr_x, qr_y, width=qr_width, height=qr_height)
-
-            # Add caption under QR code
-            c.setFont("Helvetica", 10)
-            c.setFillColor(NAVY_BLUE)
-            caption = "scan for the dinner menu"
-            caption_width = c.stringWidth(caption, "Helvetica", 10)
-            c.drawString(qr_x + (qr_width - caption_width) / 2, qr_y - 15, caption)
-
-        # Draw the main text
-        c.setFont("Helvetica-Bold", 120)  # Large font size for visibility
-        c.setFillColor(NAVY_BLUE)
-
-        # Calculate text dimensions
-        text_width = c.stringWidth(sign_text, "Helvetica-Bold", 120)
-        text_height = 120  # Approximate height of the text
-
-        # Center the text on the page
-        x = (width - text_width) / 2
-        y = (height - text_height) / 2
-
-        # Draw orange border
-        border_margin = 40  # Space between text and border
-        c.setStrokeColor(ORANGE)
-        c.setLineWidth(3)
-        c.rect(
-            x - border_margin,
-            y - border_margin,
-            text_width + 2 * border_margin,
-            text_height + 2 * border_margin,
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(
+        description="Generate Heritage Fest dish cards, menu and signs"
+    )
+    parser.add_argument(
+        "csv",
+        nargs="?",
+        default=csv_file,
+        help=f"dish submissions exported from the form (default: {csv_file})",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="PATH",
+        help="render several events listed in a JSON file, each with its own "
+        "CSV, logo, table plan and output directory, in one process",
+    )
+    parser.add_argument(
+        "--tables",
+        metavar="PATH",
+        help="JSON table plan with the number, capacity, outlets and dish types "
+        "of each table (default: tables 1 to 3 by dish type)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of processes used to render dish cards and signs (default: 1)",
+    )
+    parser.add_argument(
+        "--combined",
+        action="store_true",
+        help="render all dish cards as pages of a single dish_cards.pdf",
+    )
+    parser.add_argument(
+        "--n-up",
+        type=int,
+        choices=sorted(impositions),
+        default=1,
+        metavar="N",
+        help="print N (2, 4 or 6) cards per sheet with crop marks, "
+        "as dish_cards_<N>up.pdf",
+    )
+    parser.add_argument(
+        "--fit",
+        action="store_true",
+        help="shrink the fonts of cards whose content does not fit instead of "
+        "leaving fields out",
+    )
+    parser.add_argument(
+        "--menu-columns",
+        type=int,
+        choices=[1, 2, 3],
+        default=1,
+        help="number of columns per menu page (default: 1)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="re-render everything instead of only outputs whose inputs changed",
+    )
+    parser.add_argument(
+        "--diet-menus",
+        action="store_true",
+        help="also render vegetarian, vegan, halal, kosher and allergen-free "
+        "menus as menu_<name>.pdf",
+    )
+    parser.add_argument(
+        "--menu-variant",
+        action="append",
+        default=[],
+        metavar="NAME=TAGS",
+        help="render menu_NAME.pdf with the dishes having every tag and none of "
+        "the -tags, e.g. vegan-no-sesame=Vegan,-Sesame (repeatable)",
+    )
+    parser.add_argument(
+        "--menu-url",
+        metavar="URL",
+        help="generate the menu QR code for URL on signs and the menu, instead "
+        f"of using {qr_code_path}",
+    )
+    parser.add_argument(
+        "--card-qr",
+        action="store_true",
+        help="with --menu-url, also print the menu QR code on every dish card",
+    )
+    parser.add_argument(
+        "--sign-subtitles",
+        action="store_true",
+        help="list the dish types seated at each table under its sign",
+    )
+    parser.add_argument(
+        "--signs-pdf",
+        action="store_true",
+        help="render every sign as a page of a single signs.pdf",
+    )
+    parser.add_argument(
+        "--zip",
+        metavar="PATH",
+        help="write every output into a single ZIP archive at PATH instead of "
+        "separate files",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and rebuild whenever the CSV or images change",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=0.25,
+        help="seconds between checks for changes in --watch mode (default: 0.25)",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="serve cards, menu and signs as on-demand PDFs over HTTP",
+    )
+    parser.add_argument(
+        "--host",
+        default="0.0.0.0",
+        help="address the preview server listens on (default: 0.0.0.0)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="port of the preview server (default: 8000)",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=8,
+        help="request threads of the preview server (default: 8)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="profile.json",
+        metavar="PATH",
+        help="record per-stage and per-card timings to PATH "
+        "(default: profile.json) and print a summary",
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="with --profile, also record peak traced memory per stage",
+    )
+    parser.add_argument(
+        "--cprofile",
+        metavar="PATH",
+        help="run under cProfile and write the stats to PATH",
+    )
+    args = parser.parse_args(argv)
+    if args.combined and args.workers > 1:
+        parser.error("--combined renders into one file and cannot use --workers")
+    if args.n_up > 1 and (args.combined or args.workers > 1):
+        parser.error(
+            "--n-up renders into one file and cannot use --combined or --workers"
         )
 
-        # Draw the text
-        c.drawString(x, y, sign_text)
+    if args.card_qr and not args.menu_url:
+        parser.error("--card-qr needs --menu-url")
+    configure_qr(args.menu_url, args.card_qr)
 
-        # Save the page
-        c.save()
-        print(f"Created sign: {output_path}")
+    args.menu_filters = dict(diet_menus) if args.diet_menus else {}
+    try:
+        args.menu_filters.update(parse_menu_filter(spec) for spec in args.menu_variant)
+    except ValueError as exc:
+        parser.error(f"--menu-variant: {exc}")
+
+    args.events = None
+    if args.batch:
+        if args.watch or args.serve or args.zip:
+            parser.error("--batch cannot be combined with --watch, --serve or --zip")
+        try:
+            args.events = load_events(args.batch)
+        except (OSError, ValueError) as exc:
+            parser.error(f"cannot read the batch file: {exc}")
+
+    args.table_plan = None
+    if args.tables and not args.batch:
+        try:
+            args.table_plan = load_table_plan(args.tables)
+        except (OSError, ValueError) as exc:
+            parser.error(f"cannot read the table plan: {exc}")
+
+    metrics = enable_profiling(args.tracemalloc) if args.profile else None
+    profiler = None
+    if args.cprofile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
 
+    try:
+        with profile_stage("total"):
+            if args.batch:
+                status = run_batch(args)
+            elif args.serve:
+                status = serve(args)
+            elif args.watch:
+                status = watch(args)
+            else:
+                status = run(args)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.cprofile)
+            print(f"Wrote cProfile stats to {args.cprofile}")
+
+    if metrics is not None:
+        with open(args.profile, "w", encoding="utf-8") as f:
+            json.dump(metrics.report(), f, indent=1)
+        print(metrics.summary())
+        print(f"Wrote profile to {args.profile}")
+    return status
+
+
+def run(args, manifest=None, root="."):
+    """Render everything requested by the parsed command line arguments
+
+    Outputs are written below root. manifest is the build manifest to
+    update; by default it is loaded from manifest_path in root, or started
+    empty with --force. Rendering and writing overlap: outputs are written by
+    a ThreadedWriter while the next ones are rendered.
+    """
+    try:
+        with profile_stage("load"):
+            dishes = load_dishes(args.csv, args.table_plan)
+            print(table_summary(dishes))
+    except ValueError as exc:
+        print(f"Error: {exc}")
+        return 1
 
-# Create individual dish cards
-for idx, row in df.iterrows():
-    create_dish_card(row, idx)
-    print(f"Created dish card {idx + 1}")
+    if args.zip:
+        # The archive always holds a full build, so there is no manifest
+        writer = ThreadedWriter(ZipWriter(args.zip))
+        manifest = None
+    else:
+        writer = ThreadedWriter(DirectoryWriter(root))
+        if manifest is None:
+            manifest = {} if args.force else load_manifest(root_manifest_path(root))
+    try:
+        with profile_stage("cards"):
+            render_cards(
+                dishes,
+                workers=args.workers,
+                combined=args.combined,
+                manifest=manifest,
+                writer=writer,
+                per_sheet=args.n_up,
+                fit=args.fit,
+            )
+        with profile_stage("menu"):
+            render_menu(
+                dishes, columns=args.menu_columns, manifest=manifest, writer=writer
+            )
+            render_menu_web(dishes, manifest=manifest, writer=writer)
+            if args.menu_filters:
+                render_menu_variants(
+                    dishes, args.menu_filters, args.menu_columns, manifest, writer
+                )
+        with profile_stage("signs"):
+            render_signs(
+                manifest=manifest,
+                writer=writer,
+                tables=dishes.tables,
+                dishes=dishes if args.sign_subtitles else None,
+                single_file=args.signs_pdf,
+                workers=args.workers,
+            )
+    finally:
+        # Waits for the queued outputs; the manifest is only saved after
+        # every file it describes has been written
+        with profile_stage("flush"):
+            writer.close()
+    if manifest is not None:
+        save_manifest(manifest, root_manifest_path(root))
+    return 0
+
+
+def root_manifest_path(root):
+    """Path of the build manifest of the outputs below root"""
+    return manifest_path if root == "." else os.path.join(root, manifest_path)
+
+
+def watch(args):
+    """Rebuild incrementally whenever the CSV, logo or QR image changes
+
+    The files are polled, so no file system notification library is needed.
+    The manifest stays in memory between rebuilds, so each rebuild only
+    re-renders the cards whose rows changed, and the menu and signs only
+    when their inputs did.
+    """
+    watched = [args.csv, logo_path, qr_code_path]
+    if args.tables:
+        watched.append(args.tables)
+
+    def snapshot():
+        stamps = []
+        for path in watched:
+            try:
+                stat = os.stat(path)
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamps.append(None)
+        return stamps
+
+    manifest = {} if args.force else load_manifest()
+    last = None
+    print(f"Watching {', '.join(watched)} (Ctrl+C to stop)")
+    try:
+        while True:
+            current = snapshot()
+            if current != last:
+                # Let a download that is still being written settle first
+                time.sleep(min(args.poll_interval, 0.1))
+                if snapshot() != current:
+                    continue
+                last = current
+                start = time.perf_counter()
+                try:
+                    if args.tables:
+                        args.table_plan = load_table_plan(args.tables)
+                    status = run(args, manifest)
+                except (OSError, ValueError, csv.Error) as exc:
+                    print(f"Error: {exc}")
+                    status = 1
+                if status:
+                    # Keep watching; the next save will trigger another try
+                    print("Rebuild failed, waiting for the next change")
+                else:
+                    print(f"Rebuilt in {time.perf_counter() - start:.2f} s")
+            time.sleep(args.poll_interval)
+    except KeyboardInterrupt:
+        print("Stopped watching")
+    return 0
+
+
+@dataclass(frozen=True)
+class Event:
+    """Inputs and output directory of one event rendered by --batch"""
+
+    name: str
+    csv: str
+    logo: str = logo_path
+    qr: str = qr_code_path
+    tables: str = None
+    output_dir: str = "."
+    menu_url: str = None
+
+
+def load_events(path):
+    """Read the events of a batch from a JSON list, e.g.
 
-# Create the menu
-create_menu()
-print("Created menu.pdf")
+    [{"name": "hf26", "csv": "hf26.csv", "logo": "hf26.png",
+      "tables": "plan.json", "output_dir": "out/hf26"}]
+
+    Only csv is required. name defaults to the CSV file name, output_dir to
+    the name, and logo and qr to the default file names. A menu_url
+    overrides --menu-url for that event. Relative paths are relative to the
+    batch file.
+    """
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path}: a batch is a non-empty list of events")
+
+    base = os.path.dirname(path)
+
+    def resolve(value):
+        return None if value is None else os.path.join(base, str(value))
+
+    events = []
+    for position, entry in enumerate(entries, 1):
+        try:
+            csv_path = resolve(entry["csv"])
+            name = str(
+                entry.get("name") or os.path.splitext(os.path.basename(csv_path))[0]
+            )
+            events.append(
+                Event(
+                    name=name,
+                    csv=csv_path,
+                    logo=resolve(entry.get("logo", logo_path)),
+                    qr=resolve(entry.get("qr", qr_code_path)),
+                    tables=resolve(entry.get("tables")),
+                    output_dir=resolve(entry.get("output_dir", name)),
+                    menu_url=entry.get("menu_url"),
+                )
+            )
+        except (AttributeError, KeyError, TypeError) as exc:
+            raise ValueError(f"{path}: invalid event {position}: {exc!r}") from None
+
+    for field in ("name", "output_dir"):
+        values = [os.path.normpath(getattr(event, field)) for event in events]
+        if len(set(values)) != len(values):
+            raise ValueError(f"{path}: every event needs its own {field}")
+    return events
+
+
+@contextmanager
+def event_assets(event):
+    """Point the logo, QR image and menu URL at those of event for the body
+
+    Worker pools started in the body receive them through render_settings().
+    """
+    global logo_path, qr_code_path
+    saved = logo_path, qr_code_path, menu_url, card_qr
+    logo_path, qr_code_path = event.logo, event.qr
+    if event.menu_url:
+        configure_qr(event.menu_url, card_qr)
+    try:
+        yield
+    finally:
+        logo_path, qr_code_path = saved[:2]
+        configure_qr(*saved[2:])
+
+
+def run_batch(args):
+    """Render every event of args.events in this process
+
+    Font metrics, wrapped text, decoded images and QR codes stay cached from
+    one event to the next, so only the first event pays for warming them up.
+    Every event has its own output directory and build manifest. A failing
+    event is reported and the batch goes on. Prints a timing summary per
+    event and returns 1 if any event failed.
+    """
+    results = []
+    for event in args.events:
+        print(f"== {event.name} ==")
+        event_args = argparse.Namespace(**vars(args))
+        event_args.csv = event.csv
+        event_args.tables = event.tables
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            event_args.table_plan = event.tables and load_table_plan(event.tables)
+            with event_assets(event), profile_stage(f"event {event.name}"):
+                status = run(event_args, root=event.output_dir)
+        except (OSError, ValueError, csv.Error) as exc:
+            print(f"Error: {exc}")
+            status = 1
+        results.append(
+            (event, status, time.perf_counter() - wall, time.process_time() - cpu)
+        )
+    print(batch_summary(results))
+    return max(status for _, status, _, _ in results)
+
+
+def batch_summary(results):
+    """Return a text table of (event, status, wall s, cpu s) results"""
+    width = max(len("event"), *(len(event.name) for event, *_ in results))
+    lines = [f"{'event':<{width}}{'status':>8}{'wall s':>10}{'cpu s':>10}  output"]
+    for event, status, wall, cpu in results:
+        lines.append(
+            f"{event.name:<{width}}{'ok' if status == 0 else 'failed':>8}"
+            f"{wall:>10.3f}{cpu:>10.3f}  {event.output_dir}"
+        )
+    lines.append(
+        f"{'total':<{width}}{'':>8}{sum(r[2] for r in results):>10.3f}"
+        f"{sum(r[3] for r in results):>10.3f}"
+    )
+    widths = string_width.cache_info()
+    lines.append(
+        f"shared caches: {widths.hits} text width hits, {widths.misses} misses; "
+        f"{len(_image_cache)} decoded images"
+    )
+    return "\n".join(lines)
 
-# Create empty dish card template
-create_empty_dish_card()
 
-# Create signs
-create_signs()
+if __name__ == "__main__":
+    sys.exit(main())